@@ -0,0 +1,284 @@
+"""
+Benchmark harness for the max-flow and min-cost flow solvers.
+
+Every solver runs on a grid of generated graphs (n, r, upperCap, upperCost) with
+warm-up runs and repeated timed runs. For each (graph, solver) cell it records the
+median and p95 wall-clock time and the peak memory traced during one extra run.
+Scaling exponents k come from a least-squares fit of log(median time) against
+log(n) and log(m) (time ~ size^k).
+
+A run can be saved as a JSON baseline, and a later run compared against it: a cell is
+a regression when its median time grows past the threshold ratio or its flow or cost changes.
+
+    python benchmark.py --save Results/benchmark_baseline.json
+    python benchmark.py --baseline Results/benchmark_baseline.json --threshold 1.25
+"""
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+from graph import Graph
+from graph_io import edge_columns
+from max_flow import maximum_flow
+from source_sink_graph_generator import generate_sink_source_graph
+
+BASELINE_VERSION = 1
+
+# Default grid: every combination is one graph
+default_sizes = (100, 200, 400)
+default_radii = (0.2, 0.3)
+default_upper_caps = (8, 64)
+default_upper_costs = (5, 20)
+
+lcc_mode = "reachable"
+demand_fraction = 0.95  # Demand as a fraction of fmax, as in main.py
+
+
+def _edmonds_karp(graph, source, sink, demand):
+    """Edmonds-Karp max flow in the (flow, cost, paths, ml, mpl) shape of the min-cost solvers."""
+    return maximum_flow(graph, source, sink, "edmonds_karp"), None, None, None, None
+
+
+def solvers():
+    """Solver name -> function(graph, source, sink, demand): the main.py algorithms plus Edmonds-Karp."""
+    from main import algorithms
+
+    return {**algorithms, "EK": _edmonds_karp}
+
+
+# ----------------- Measurement ----------------- #
+def percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def time_solver(function, graph, source, sink, demand, warmup=1, repeats=5):
+    """
+    Runs function on graph (flows reset before every run, solver output suppressed).
+    Returns (result, times, traced_peak_bytes); the traced peak comes from one extra
+    run under tracemalloc, so it does not slow down the timed runs.
+    """
+    result = None
+    times = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for k in range(warmup + repeats):
+            graph.reset_flows()
+            start = time.perf_counter()
+            result = function(graph, source, sink, demand)
+            elapsed = time.perf_counter() - start
+            if k >= warmup:
+                times.append(elapsed)
+
+        graph.reset_flows()
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        function(graph, source, sink, demand)
+        traced_peak = tracemalloc.get_traced_memory()[1]
+        if not tracing:
+            tracemalloc.stop()
+    return result, times, traced_peak
+
+
+# ----------------- Grid ----------------- #
+def build_graph(n, r, upper_cap, upper_cost, seed):
+    """Generates a source-sink graph and loads it into a Graph, as main.py would from its file."""
+    graph = Graph()
+    for u, v, capacity, cost in zip(*edge_columns(generate_sink_source_graph(n, r, upper_cap, upper_cost, seed))):
+        graph.add_edge(u, v, capacity, cost)
+    return graph
+
+
+def run_benchmark(sizes=default_sizes, radii=default_radii, upper_caps=default_upper_caps,
+                  upper_costs=default_upper_costs, algorithms=None, warmup=1, repeats=5, seed=0):
+    """
+    Benchmarks every solver (all of them unless algorithms names a subset) on every graph of the grid.
+    Graph i of the grid is generated with seed + i, so a grid is reproducible.
+    Returns the benchmark as a JSON-serialisable dict.
+    """
+    available = solvers()
+    names = list(available) if algorithms is None else list(algorithms)
+    for name in names:
+        if name not in available:
+            raise ValueError(f"Unknown algorithm '{name}', expected one of {', '.join(available)}")
+
+    cells = []
+    grid = [(n, r, cap, cost) for n in sizes for r in radii for cap in upper_caps for cost in upper_costs]
+    for i, (n, r, upper_cap, upper_cost) in enumerate(grid):
+        graph = build_graph(n, r, upper_cap, upper_cost, seed + i)
+        with contextlib.redirect_stdout(io.StringIO()):
+            analysis = graph.analysis(lcc_mode)
+            source, sink = analysis.source, analysis.sink
+            fmax = maximum_flow(graph, source, sink, "dinic") if source != sink else 0
+        demand = demand_fraction * fmax
+        print(f"n={n} r={r} upperCap={upper_cap} upperCost={upper_cost}: "
+              f"{len(graph.adjacency_list)} nodes, {len(graph.edges)} edges, fmax={fmax}")
+
+        for name in names:
+            cell = {
+                "algorithm": name, "n": n, "r": r, "upper_cap": upper_cap, "upper_cost": upper_cost,
+                "seed": seed + i, "nodes": len(graph.adjacency_list), "edges": len(graph.edges),
+            }
+            if source == sink:
+                cell["skipped"] = "source == sink"  # Edmonds-Karp would not terminate
+                cells.append(cell)
+                continue
+
+            result, times, traced_peak = time_solver(available[name], graph, source, sink, demand, warmup, repeats)
+            cell.update({
+                "flow": result[0], "cost": result[1],
+                "median": statistics.median(times), "p95": percentile(times, 0.95),
+                "min": min(times), "repeats": len(times),
+                "traced_peak_bytes": traced_peak,
+            })
+            cells.append(cell)
+            print(f"  {name:<16} median {cell['median'] * 1000:10.3f} ms   p95 {cell['p95'] * 1000:10.3f} ms   "
+                  f"traced peak {traced_peak / 1024:10.1f} KiB")
+
+    return {
+        "version": BASELINE_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "warmup": warmup,
+        "repeats": repeats,
+        "cells": cells,
+        "exponents": scaling_exponents(cells),
+    }
+
+
+# ----------------- Scaling ----------------- #
+def fit_exponent(sizes, times):
+    """
+    Slope of the least-squares line through (log size, log time), i.e. k in time ~ size^k.
+    None when there are fewer than two distinct sizes.
+    """
+    points = [(math.log(x), math.log(y)) for x, y in zip(sizes, times) if x > 0 and y > 0]
+    if len({x for x, _ in points}) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    sxx = sum((x - mean_x) ** 2 for x, _ in points)
+    sxy = sum((x - mean_x) * (y - mean_y) for x, y in points)
+    return sxy / sxx
+
+
+def scaling_exponents(cells):
+    """Per algorithm, the fitted exponents of median time against nodes and against edges."""
+    by_algorithm = {}
+    for cell in cells:
+        if "median" in cell:
+            by_algorithm.setdefault(cell["algorithm"], []).append(cell)
+    return {
+        name: {
+            "nodes": fit_exponent([c["nodes"] for c in group], [c["median"] for c in group]),
+            "edges": fit_exponent([c["edges"] for c in group], [c["median"] for c in group]),
+        }
+        for name, group in by_algorithm.items()
+    }
+
+
+# ----------------- Baselines ----------------- #
+def _cell_key(cell):
+    return cell["algorithm"], cell["n"], cell["r"], cell["upper_cap"], cell["upper_cost"], cell["seed"]
+
+
+def save_baseline(benchmark, file_path):
+    folder_path = os.path.dirname(file_path)
+    if folder_path:
+        os.makedirs(folder_path, exist_ok=True)
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump(benchmark, f, indent=2)
+
+
+def load_baseline(file_path):
+    with open(file_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline.get("version") != BASELINE_VERSION:
+        raise ValueError(f"{file_path}: unsupported baseline version {baseline.get('version')!r}")
+    return baseline
+
+
+def compare_to_baseline(benchmark, baseline, threshold=1.25, min_seconds=1e-3):
+    """
+    Lists the regressions of benchmark against baseline, as readable strings:
+    cells whose median time exceeds threshold times the baseline median (cells under
+    min_seconds in both runs are timer noise and never flagged), and cells whose flow
+    or cost changed. Cells present in only one of the two runs are ignored.
+    """
+    previous = {_cell_key(cell): cell for cell in baseline["cells"]}
+    regressions = []
+    for cell in benchmark["cells"]:
+        old = previous.get(_cell_key(cell))
+        if old is None or "median" not in cell or "median" not in old:
+            continue
+        label = "{} n={} r={} cap={} cost={} seed={}".format(*_cell_key(cell))
+
+        if (cell["flow"], cell["cost"]) != (old["flow"], old["cost"]):
+            regressions.append(f"{label}: result changed from flow={old['flow']} cost={old['cost']} "
+                               f"to flow={cell['flow']} cost={cell['cost']}")
+        if max(cell["median"], old["median"]) >= min_seconds and cell["median"] > threshold * old["median"]:
+            regressions.append(f"{label}: median {old['median'] * 1000:.3f} ms -> {cell['median'] * 1000:.3f} ms "
+                               f"({cell['median'] / old['median']:.2f}x)")
+    return regressions
+
+
+def print_exponents(exponents):
+    print("Scaling exponents (time ~ size^k)")
+    for name, fitted in exponents.items():
+        nodes = "n/a" if fitted["nodes"] is None else f"{fitted['nodes']:.2f}"
+        edges = "n/a" if fitted["edges"] is None else f"{fitted['edges']:.2f}"
+        print(f"  {name:<16} k(nodes) = {nodes:>6}   k(edges) = {edges:>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the flow solvers on a grid of generated graphs.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=default_sizes, help="node counts n")
+    parser.add_argument("--radii", type=float, nargs="+", default=default_radii, help="connection radii r")
+    parser.add_argument("--caps", type=int, nargs="+", default=default_upper_caps, help="upper capacities")
+    parser.add_argument("--costs", type=int, nargs="+", default=default_upper_costs, help="upper costs")
+    parser.add_argument("--algorithms", nargs="+", help="solvers to run (default: all)")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed runs per cell")
+    parser.add_argument("--repeats", type=int, default=5, help="timed runs per cell")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first graph of the grid")
+    parser.add_argument("--save", help="write the run as a JSON baseline")
+    parser.add_argument("--baseline", help="compare the run against this JSON baseline")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="median time ratio above which a cell counts as a regression")
+    args = parser.parse_args()
+    if args.repeats < 1:
+        parser.error("--repeats must be at least 1")
+
+    benchmark = run_benchmark(args.sizes, args.radii, args.caps, args.costs, args.algorithms,
+                              args.warmup, args.repeats, args.seed)
+    print()
+    print_exponents(benchmark["exponents"])
+
+    if args.save:
+        save_baseline(benchmark, args.save)
+        print(f"Baseline written to {args.save}")
+
+    if args.baseline:
+        regressions = compare_to_baseline(benchmark, load_baseline(args.baseline), args.threshold)
+        print()
+        if regressions:
+            print(f"{len(regressions)} regression(s) against {args.baseline}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"No regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,26 +1,40 @@
 import math
-from utility import bellman_ford_capacity_scaling, find_longest_acyclic_path
+from path_metrics import PathLengthStats, path_length_metrics
+from utility import bellman_ford_capacity_scaling, cancel_negative_cycles
 
 # Capacity Scaling Algorithm
 
-def capacity_scaling_with_metrics(graph, source, sink, demand):
+def capacity_scaling_with_metrics(graph, source, sink, demand, method="bellman_ford", stats=None, mpl_mode="nodes",
+                                  path_stats=None):
+    """
+    method selects the shortest-path kernel: "bellman_ford" or the queue-based "spfa".
+    stats: optional instrumentation.SolverStats that counts the work done.
+    mpl_mode: MPL denominator, see path_metrics.
+    path_stats: path_metrics.PathLengthStats to accumulate the path lengths into, e.g. one with a
+        histogram or keep_paths=True; by default a plain one is used.
+    """
     print("==== CAPACITY SCALING ====")
     max_capacity = max(edge.capacity for edge in graph.edges)
     scaling_factor = 2 ** (math.floor(math.log2(max_capacity)))
+    # Residual capacity below this is a rounding leftover of a fractional demand
+    min_residual = 1 if isinstance(demand, int) else 1e-9 * max(1, demand)
     total_flow = 0
     total_cost = 0
-    augmenting_paths = []
-    path_lengths = []
+    path_lengths = PathLengthStats() if path_stats is None else path_stats
 
     while scaling_factor >= 1:
+        if stats is not None:
+            stats.begin_phase(f"delta={scaling_factor}")
         while demand > 0:
-            path, bottleneck = bellman_ford_capacity_scaling(graph, source, sink, scaling_factor)
+            if stats is not None:
+                stats.searches += 1
+            path, bottleneck = bellman_ford_capacity_scaling(graph, source, sink, scaling_factor, method, stats)
             if not path:
                 break
 
-            # Track path and its length
-            augmenting_paths.append(path)
-            path_lengths.append(len(path))
+            # Track the path length
+            nodes = [source] + [edge.to_node for edge in path] if path_lengths.keep_paths else None
+            path_lengths.add(len(path), nodes)
 
             # Adjust flow along the augmenting path
             flow_to_add = min(bottleneck, demand)
@@ -30,16 +44,22 @@ def capacity_scaling_with_metrics(graph, source, sink, demand):
             total_flow += flow_to_add
             total_cost += flow_to_add * sum(edge.cost for edge in path)
             demand -= flow_to_add
+            if stats is not None:
+                stats.augmentations += 1
 
         scaling_factor //= 2
+        if graph.residual and scaling_factor >= 1 and demand > 0:
+            total_cost += cancel_negative_cycles(graph, scaling_factor, stats)
+
+    # A demand met before the delta=1 phase, or a fractional last push, leaves the flow
+    # optimal only over the arcs of the last phase
+    if graph.residual and demand <= 0:
+        total_cost += cancel_negative_cycles(graph, min_residual, stats)
 
     # Calculate metrics
     if demand > 0:
         return None, -1, None,None,None
     else:
-        num_paths = len(augmenting_paths)
-        mean_length = sum(path_lengths) / num_paths if num_paths > 0 else 0
-        longest_acyclic_path = find_longest_acyclic_path(graph, source, sink)
-        mean_proportional_length = mean_length / longest_acyclic_path if longest_acyclic_path > 0 else 0
+        mean_length, mean_proportional_length = path_length_metrics(path_lengths, graph, source, mpl_mode)
 
-        return total_flow, total_cost, num_paths, mean_length, mean_proportional_length
\ No newline at end of file
+        return total_flow, total_cost, path_lengths.count, mean_length, mean_proportional_length
\ No newline at end of file
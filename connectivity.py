@@ -0,0 +1,181 @@
+"""
+Linear-time connectivity on Graph / CSRGraph objects.
+
+Everything here is iterative, so deep graphs do not hit Python's recursion limit,
+and only forward edges count (backward arcs of residual graphs are ignored).
+"""
+
+
+def _successors(graph, node):
+    return [edge.to_node for edge in graph.out_edges(node)]
+
+
+# ----------------- Reachability ----------------- #
+def depth_first_order(graph, start, visited):
+    """
+    Nodes reachable from start that are not yet in visited, in DFS preorder.
+    Adds them to visited.
+    """
+    order = [start]
+    visited.add(start)
+    stack = [iter(_successors(graph, start))]
+
+    while stack:
+        for node in stack[-1]:
+            if node not in visited:
+                visited.add(node)
+                order.append(node)
+                stack.append(iter(_successors(graph, node)))
+                break
+        else:
+            stack.pop()
+
+    return order
+
+
+# ----------------- Strongly Connected Components ----------------- #
+def strongly_connected_components(graph):
+    """
+    Tarjan's algorithm with an explicit stack. Returns the components as lists of
+    nodes in discovery order, in reverse topological order of the condensation.
+    """
+    index = {}
+    low = {}
+    on_stack = set()
+    stack = []
+    components = []
+    counter = 0
+
+    for root in list(graph.adjacency_list.keys()):
+        if root in index:
+            continue
+
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(_successors(graph, root)))]
+
+        while work:
+            node, successors = work[-1]
+            for w in successors:
+                if w not in index:
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack.add(w)
+                    work.append((w, iter(_successors(graph, w))))
+                    break
+                if w in on_stack and index[w] < low[node]:
+                    low[node] = index[w]
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if low[node] < low[parent]:
+                        low[parent] = low[node]
+
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        w = stack.pop()
+                        on_stack.discard(w)
+                        component.append(w)
+                        if w == node:
+                            break
+                    component.reverse()
+                    components.append(component)
+
+    return components
+
+
+# ----------------- Weakly Connected Components ----------------- #
+def weakly_connected_components(graph):
+    """
+    Union-find (union by size, path halving) over the forward edges.
+    Returns the components as lists of nodes in first-seen order.
+    """
+    parent = {}
+    size = {}
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def add(x):
+        if x not in parent:
+            parent[x] = x
+            size[x] = 1
+
+    for node in graph.adjacency_list.keys():
+        add(node)
+    for edge in graph.edges:
+        u, v = edge.from_node, edge.to_node
+        add(u)
+        add(v)
+        root_u, root_v = find(u), find(v)
+        if root_u != root_v:
+            if size[root_u] < size[root_v]:
+                root_u, root_v = root_v, root_u
+            parent[root_v] = root_u
+            size[root_u] += size[root_v]
+
+    groups = {}
+    for node in parent:
+        groups.setdefault(find(node), []).append(node)
+    return list(groups.values())
+
+
+# ----------------- Largest Component ----------------- #
+def _largest_reachable_set(graph):
+    """
+    The first largest reachable set in adjacency order. A node reached from an earlier start
+    can never reach strictly more, so only the nodes no earlier start reached are searched.
+    """
+    nodes = list(graph.adjacency_list.keys())
+    unreached = set(nodes)  # Start nodes no earlier start has reached
+    largest = []
+    for node in nodes:
+        if node not in unreached:
+            continue
+        component = depth_first_order(graph, node, set())
+        unreached.difference_update(component)
+        if len(component) > len(largest):
+            largest = component
+        if not unreached:
+            break  # Every remaining start node is covered
+    return largest
+
+
+def largest_component(graph, mode="reachable"):
+    """
+    Largest component under the chosen semantics:
+        "reachable" - largest set of nodes reachable from one start node, the default; start
+                      nodes reached from an earlier start are skipped (their set is contained
+                      in the earlier one), but it is still O(V * E) in the worst case
+        "dfs"       - largest tree of a DFS forest over the nodes in adjacency order; linear,
+                      but not a connected component, and it depends on the node order
+        "scc"       - largest strongly connected component
+        "wcc"       - largest weakly connected component
+    For "dfs" and "reachable" the first node is the start node that reaches the rest.
+    """
+    if mode == "scc":
+        components = strongly_connected_components(graph)
+    elif mode == "wcc":
+        components = weakly_connected_components(graph)
+    elif mode == "dfs":
+        visited = set()
+        components = [depth_first_order(graph, node, visited)
+                      for node in list(graph.adjacency_list.keys()) if node not in visited]
+    elif mode == "reachable":
+        return _largest_reachable_set(graph)
+    else:
+        raise ValueError(f"Unknown component mode '{mode}'")
+
+    largest = []
+    for component in components:
+        if len(component) > len(largest):
+            largest = component
+    return largest
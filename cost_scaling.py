@@ -0,0 +1,121 @@
+from collections import deque
+
+from max_flow import node_ids, node_labels, push_relabel, residual_arrays
+from path_metrics import PathLengthStats, path_length_metrics
+from utility import decompose_flow
+
+
+def _refine(epsilon, first, head, rev, capacity, cost, excess, price, tolerance=0, stats=None):
+    """
+    Turns the current flow into an epsilon-optimal one: saturate every arc with
+    negative reduced cost, then push/relabel (FIFO) until no node has excess.
+    Excess up to tolerance counts as none (rounding leftovers of a fractional demand).
+    """
+    n = len(first) - 1
+    for u in range(n):
+        pu = price[u]
+        for a in range(first[u], first[u + 1]):
+            if capacity[a] > 0 and cost[a] + pu - price[head[a]] < 0:
+                delta = capacity[a]
+                capacity[a] = 0
+                capacity[rev[a]] += delta
+                excess[u] -= delta
+                excess[head[a]] += delta
+                if stats is not None:
+                    stats.pushes += 1
+
+    queue = deque(u for u in range(n) if excess[u] > tolerance)
+    current = first[:n]
+    while queue:
+        u = queue.popleft()
+        while excess[u] > tolerance:
+            # Push along admissible arcs (residual, negative reduced cost)
+            pu = price[u]
+            end = first[u + 1]
+            a = current[u]
+            while a < end and not (capacity[a] > 0 and cost[a] + pu - price[head[a]] < 0):
+                a += 1
+            current[u] = a
+
+            if a < end:
+                v = head[a]
+                delta = min(excess[u], capacity[a])
+                capacity[a] -= delta
+                capacity[rev[a]] += delta
+                excess[u] -= delta
+                if excess[v] <= tolerance < excess[v] + delta:
+                    queue.append(v)
+                excess[v] += delta
+                if stats is not None:
+                    stats.pushes += 1
+                continue
+
+            # Relabel: lower the price just enough to make one residual arc admissible
+            best = None
+            for b in range(first[u], end):
+                if capacity[b] > 0:
+                    candidate = price[head[b]] - cost[b]
+                    if best is None or candidate > best:
+                        best = candidate
+            price[u] = best - epsilon
+            current[u] = first[u]
+            if stats is not None:
+                stats.relabels += 1
+                stats.arcs_scanned += end - first[u]
+
+
+# Cost Scaling (Goldberg-Tarjan) Algorithm
+def cost_scaling(graph, source, sink, demand, alpha=16, stats=None, mpl_mode="nodes", path_stats=None):
+    """
+    Cost-scaling push-relabel minimum-cost flow. Costs are multiplied by n + 1 so that
+    the final 1-optimal flow is optimal, and epsilon shrinks by alpha per refine phase.
+    It always works in the full residual network, whatever graph.residual says.
+    paths, ML and MPL come from a decomposition of the final flow into source-sink paths.
+    stats: optional instrumentation.SolverStats; every refine is a phase.
+    mpl_mode: MPL denominator, see path_metrics.
+    path_stats: path_metrics.PathLengthStats to accumulate the path lengths into, e.g. one with a
+        histogram or keep_paths=True; by default a plain one is used.
+    """
+    print("==== COST SCALING ====")
+    ids, first, head, rev, capacity, cost = residual_arrays(graph)
+    s, t = node_ids(graph, ids, source, sink)
+    if demand > 0 and (s is None or t is None or push_relabel(graph, source, sink) < demand):
+        return None, -1, None, None, None  # Failure: Not enough flow to satisfy demand
+
+    n = len(first) - 1
+    original = capacity[:]
+    scaled = [c * (n + 1) for c in cost]
+    excess = [0] * n
+    price = [0] * n
+    if demand > 0:
+        excess[s] += demand
+        excess[t] -= demand
+
+    tolerance = 0 if isinstance(demand, int) else 1e-9 * max(1, demand)
+    epsilon = max((abs(c) for c in scaled), default=0)
+    while True:
+        epsilon = max(epsilon // alpha, 1)
+        if stats is not None:
+            stats.begin_phase(f"epsilon={epsilon}")
+        _refine(epsilon, first, head, rev, capacity, scaled, excess, price, tolerance, stats)
+        if epsilon == 1:
+            break
+
+    # Flow on each arc, in the direction that carries it
+    arc_flows = []
+    total_cost = 0
+    for a in range(len(head)):
+        flow = original[a] - capacity[a]
+        if flow > 0:
+            arc_flows.append((head[rev[a]], head[a], flow))
+            total_cost += flow * cost[a]
+
+    # Calculate metrics
+    label = node_labels(graph, ids)
+    path_lengths = PathLengthStats() if path_stats is None else path_stats
+    if demand > 0:
+        for _, path in decompose_flow(arc_flows, s, t):
+            path_lengths.add(len(path) - 1, [label(u) for u in path] if path_lengths.keep_paths else None)
+    mean_length, mean_proportional_length = path_length_metrics(path_lengths, graph, source, mpl_mode)
+
+    return demand, total_cost, path_lengths.count, mean_length, mean_proportional_length
@@ -0,0 +1,335 @@
+import copy
+from array import array
+from collections.abc import Sequence
+
+
+class CSREdge:
+    """
+    Lightweight handle to one arc of a CSRGraph.
+
+    Exposes the same attributes as graph.Edge (from_node, to_node, capacity,
+    cost, flow, reverse_edge) so the solvers can run on a CSRGraph unchanged.
+    The endpoints and cost are fixed and stored on the handle; capacity and flow
+    reads and writes go straight to the graph's arrays.
+    """
+    __slots__ = ('graph', 'index', 'from_node', 'to_node', 'cost')
+
+    def __init__(self, graph, index):
+        self.graph = graph
+        self.index = index
+        self.from_node = graph.node_label(graph.tail[index])
+        self.to_node = graph.node_label(graph.head[index])
+        self.cost = graph.cost[index]
+
+    @property
+    def capacity(self):
+        return self.graph.capacity[self.index]
+
+    @capacity.setter
+    def capacity(self, value):
+        self.graph.capacity[self.index] = value
+
+    @property
+    def flow(self):
+        return self.graph.flow[self.index]
+
+    @flow.setter
+    def flow(self, value):
+        self.graph.flow[self.index] = value
+
+    @property
+    def reverse_edge(self):
+        return self.graph.arc_handles()[self.graph.rev[self.index]]
+
+    def __eq__(self, other):
+        return isinstance(other, CSREdge) and self.graph is other.graph and self.index == other.index
+
+    def __hash__(self):
+        return hash((id(self.graph), self.index))
+
+
+class _AdjacencyView(dict):
+    """
+    `adjacency_list` replacement: node label -> list of out-arcs, built once per graph.
+    Unknown labels give an empty list, like the defaultdict of graph.Graph, without
+    being added. Treat it and its lists as read-only.
+    """
+
+    def __init__(self, graph):
+        handles = graph.arc_handles()
+        super().__init__((graph.node_label(i), [handles[a] for a in graph.adjacent_arcs(i)])
+                         for i in range(graph.num_nodes))
+
+    def __missing__(self, label):
+        return []
+
+
+class _EdgeListView(Sequence):
+    """Read-only `edges` replacement: the forward arcs in input order."""
+
+    def __init__(self, graph):
+        self._handles = graph.forward_handles()
+
+    def __getitem__(self, k):
+        return self._handles[k]
+
+    def __iter__(self):
+        return iter(self._handles)
+
+    def __len__(self):
+        return len(self._handles)
+
+
+class _ArcListView(_EdgeListView):
+    """Read-only view of every residual arc, forward and backward, in storage order."""
+
+    def __init__(self, graph):
+        self._handles = graph.arc_handles()
+
+
+class CSRGraph:
+    """
+    Frozen compressed-sparse-row residual graph.
+
+    Every input edge (u, v, capacity, cost) becomes a forward arc u -> v and a
+    paired backward arc v -> u with zero capacity and negated cost, so the
+    reverse of arc a is always rev[a]. Arcs are grouped by tail node: the
+    out-arcs of node i are first_out[i]:first_out[i + 1], forward arcs first
+    and backward arcs from first_back[i] on.
+
+    Nodes are stored as dense indices 0..n-1; `labels` maps them back to the
+    ids used in the input. `adjacency_list` and `edges` give the same view as
+    graph.Graph so the existing solvers can run on a CSRGraph directly; with
+    residual=True the adjacency view also lists the backward arcs, like a
+    residual graph.Graph.
+    """
+
+    def __init__(self, labels, first_out, first_back, head, tail, rev, base_capacity, cost, forward_arcs,
+                 residual=False):
+        self.residual = residual
+        self.labels = labels
+        self._index = None if _is_identity(labels) else {label: i for i, label in enumerate(labels)}
+
+        # Topology (never modified after construction)
+        self.first_out = first_out
+        self.first_back = first_back
+        self.head = head
+        self.tail = tail
+        self.rev = rev
+        self.base_capacity = base_capacity
+        self.cost = cost
+        self.forward_arcs = forward_arcs
+
+        self._analyses = {}
+        self._handles = None
+        self._forward_handles = None
+        self._adjacency = None
+
+        # Flow state
+        self.capacity = array('d', base_capacity)
+        self.flow = array('d', bytes(8 * len(head)))
+
+    # ----------------- Flow State ----------------- #
+    def reset_flows(self):
+        """Restores the original capacities and zero flow in place (two array copies)."""
+        self.capacity[:] = array('d', self.base_capacity)
+        self.flow[:] = array('d', bytes(8 * len(self.head)))
+
+    def with_fresh_flows(self):
+        """
+        A CSRGraph sharing this one's topology arrays and cached analyses, with its
+        own freshly reset capacity and flow buffers. Solvers can run on several of
+        these at once without copying the topology.
+        """
+        fresh = copy.copy(self)
+        fresh._handles = fresh._forward_handles = fresh._adjacency = None  # Handles use their graph's arrays
+        fresh.capacity = array('d', self.base_capacity)
+        fresh.flow = array('d', bytes(8 * len(self.head)))
+        return fresh
+
+    # ----------------- Construction ----------------- #
+    @classmethod
+    def from_edges(cls, edges, residual=False):
+        """
+        Builds a CSRGraph from an iterable of (u, v, capacity, cost) tuples.
+        """
+        tails, heads, capacities, costs = array('q'), array('q'), array('q'), array('q')
+        for u, v, capacity, cost in edges:
+            tails.append(u)
+            heads.append(v)
+            capacities.append(capacity)
+            costs.append(cost)
+        return cls.from_arrays(tails, heads, capacities, costs, residual)
+
+    @classmethod
+    def from_graph(cls, graph):
+        """
+        Builds a CSRGraph from the forward edges of a graph.Graph, keeping its residual mode.
+        """
+        return cls.from_edges(((e.from_node, e.to_node, e.capacity, e.cost) for e in graph.edges),
+                              getattr(graph, 'residual', False))
+
+    @classmethod
+    def from_arrays(cls, tails, heads, capacities, costs, residual=False):
+        """
+        Builds a CSRGraph from four equally long columns of edge data.
+        """
+        m = len(tails)
+        if not (len(heads) == len(capacities) == len(costs) == m):
+            raise ValueError("Edge columns must have the same length")
+
+        labels = array('q', sorted(set(tails).union(heads)))
+        n = len(labels)
+        if _is_identity(labels):
+            tail_idx, head_idx = tails, heads
+        else:
+            index = {label: i for i, label in enumerate(labels)}
+            tail_idx = array('i', (index[u] for u in tails))
+            head_idx = array('i', (index[v] for v in heads))
+
+        # Count forward (out) and backward (in) arcs per node
+        out_degree = [0] * n
+        in_degree = [0] * n
+        for u in tail_idx:
+            out_degree[u] += 1
+        for v in head_idx:
+            in_degree[v] += 1
+
+        first_out = array('q', bytes(8 * (n + 1)))
+        first_back = array('q', bytes(8 * n))
+        offset = 0
+        for i in range(n):
+            first_out[i] = offset
+            first_back[i] = offset + out_degree[i]
+            offset += out_degree[i] + in_degree[i]
+        first_out[n] = offset
+
+        head = array('i', bytes(4 * 2 * m))
+        tail = array('i', bytes(4 * 2 * m))
+        rev = array('i', bytes(4 * 2 * m))
+        base_capacity = array('q', bytes(8 * 2 * m))
+        cost = array('q', bytes(8 * 2 * m))
+        forward_arcs = array('i', bytes(4 * m))
+
+        next_forward = array('q', first_out[:n])
+        next_backward = array('q', first_back)
+        for k in range(m):
+            u = tail_idx[k]
+            v = head_idx[k]
+            a = next_forward[u]
+            next_forward[u] = a + 1
+            b = next_backward[v]
+            next_backward[v] = b + 1
+
+            head[a], tail[a], rev[a] = v, u, b
+            base_capacity[a] = capacities[k]
+            cost[a] = costs[k]
+
+            head[b], tail[b], rev[b] = u, v, a
+            cost[b] = -costs[k]
+
+            forward_arcs[k] = a
+
+        return cls(labels, first_out, first_back, head, tail, rev, base_capacity, cost, forward_arcs, residual)
+
+    def analysis(self, lcc_mode="reachable"):
+        """Cached GraphAnalysis (LCC, degrees, source/sink); the topology never changes."""
+        if lcc_mode not in self._analyses:
+            from graph_analysis import GraphAnalysis
+            self._analyses[lcc_mode] = GraphAnalysis(self, lcc_mode)
+        return self._analyses[lcc_mode]
+
+    # ----------------- Node and Arc Access ----------------- #
+    @property
+    def num_nodes(self):
+        return len(self.labels)
+
+    @property
+    def num_edges(self):
+        return len(self.forward_arcs)
+
+    def node_index(self, label):
+        """Dense index of a node label, or None if the node does not exist."""
+        if self._index is None:
+            try:
+                return label if 0 <= label < len(self.labels) else None
+            except TypeError:
+                return None
+        return self._index.get(label)
+
+    def node_label(self, i):
+        return i if self._index is None else self.labels[i]
+
+    def out_arcs(self, i):
+        """Arc indices of the forward out-arcs of node index i."""
+        return range(self.first_out[i], self.first_back[i])
+
+    def residual_arcs(self, i):
+        """Arc indices of all residual out-arcs (forward and backward) of node index i."""
+        return range(self.first_out[i], self.first_out[i + 1])
+
+    def adjacent_arcs(self, i):
+        """Arc indices the adjacency view lists for node index i, following the residual mode."""
+        return self.residual_arcs(i) if self.residual else self.out_arcs(i)
+
+    def is_forward(self, a):
+        return a < self.first_back[self.tail[a]]
+
+    def arc_handles(self):
+        """One CSREdge per arc, indexed by arc; built on first use and reused afterwards."""
+        if self._handles is None:
+            self._handles = [CSREdge(self, a) for a in range(len(self.head))]
+        return self._handles
+
+    def forward_handles(self):
+        """The CSREdge of every forward arc, in input order; built on first use."""
+        if self._forward_handles is None:
+            handles = self.arc_handles()
+            self._forward_handles = [handles[a] for a in self.forward_arcs]
+        return self._forward_handles
+
+    # ----------------- graph.Graph Compatibility ----------------- #
+    @property
+    def adjacency_list(self):
+        if self._adjacency is None:
+            self._adjacency = _AdjacencyView(self)
+        return self._adjacency
+
+    @property
+    def edges(self):
+        return _EdgeListView(self)
+
+    @property
+    def residual_edges(self):
+        """Edges a residual search should scan: every arc in residual mode, the forward edges otherwise."""
+        return _ArcListView(self) if self.residual else _EdgeListView(self)
+
+    def get_neighbors(self, node):
+        return self.adjacency_list[node]
+
+    def out_edges(self, node):
+        """Forward edges leaving node, skipping backward arcs in residual mode."""
+        i = self.node_index(node)
+        if i is None:
+            return []
+        handles = self.arc_handles()
+        return [handles[a] for a in self.out_arcs(i)]
+
+    def print_graph(self):
+        for node, edges in self.adjacency_list.items():
+            for edge in edges:
+                if edge.capacity > 0:
+                    print(f"{node} -> {edge.to_node} | Capacity: {edge.capacity}, Cost: {edge.cost}, Flow: {edge.flow}")
+
+    def __str__(self):
+        result = []
+        for node, edges in self.adjacency_list.items():
+            connections = [str(edge.to_node) for edge in edges if edge.capacity > 0]
+            if connections:
+                result.append(f"{node} -> {', '.join(connections)}")
+        return '\n'.join(result)
+
+
+def _is_identity(labels):
+    """True when the sorted, distinct labels are exactly 0..n-1."""
+    return len(labels) == 0 or (labels[0] == 0 and labels[-1] == len(labels) - 1)
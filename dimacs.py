@@ -0,0 +1,186 @@
+"""
+DIMACS minimum-cost flow (.min) files.
+
+    c <comment>
+    p min <nodes> <arcs>
+    n <id> <supply>                                  (positive: supply, negative: demand)
+    a <tail> <head> <lower bound> <capacity> <cost>
+
+The solvers take a single source, sink and demand, so read_dimacs_min reduces a
+problem with supplies and lower bounds to that form. Lower bounds are pre-sent and
+become a cost offset. Nodes with supply hang off a super source (node 0) and nodes
+with demand feed a super sink (node <nodes> + 1). A problem with a single supply
+node and a single demand node uses those nodes directly.
+
+Not supported:
+    - circulations (no net supply once lower bounds are pre-sent): solve() raises ValueError;
+    - negative-cost cycles: the solvers assume the zero flow has none, as the
+      shortest-path searches of SSP/CS/SSPCS/PD need.
+"""
+import os
+from array import array
+
+from csr_graph import CSRGraph
+
+
+class DimacsInstance:
+    """
+    A DIMACS problem as a single-commodity s-t flow: send demand units from source
+    to sink in graph. cost_offset is the cost of the flow pre-sent on lower bounds.
+    A circulation has demand 0 and no source or sink (both None).
+    """
+
+    def __init__(self, graph, source, sink, demand, cost_offset, supplies):
+        self.graph = graph
+        self.source = source
+        self.sink = sink
+        self.demand = demand
+        self.cost_offset = cost_offset
+        self.supplies = supplies
+
+    def solve(self, algorithm):
+        """
+        Runs one of the min-cost flow solvers on the instance, from zero flow.
+        Returns its (flow, cost, paths, ml, mpl), with the lower-bound cost included.
+        """
+        if self.demand == 0:
+            raise ValueError("The instance is a circulation (no net supply); min-cost circulations are not "
+                             "supported, the solvers only send flow from a source to a sink")
+        self.graph.reset_flows()
+        flow, cost, paths, ml, mpl = algorithm(self.graph, self.source, self.sink, self.demand)
+        if flow is not None:
+            cost += self.cost_offset
+        return flow, cost, paths, ml, mpl
+
+
+# ----------------- Reader ----------------- #
+def _line_error(filename, line_number, line, message):
+    return ValueError(f"{filename}, line {line_number}: {message}: {line.strip()!r}")
+
+
+def read_dimacs_min(filename, residual=True):
+    """
+    Streams a DIMACS .min file into a CSRGraph and returns a DimacsInstance.
+    The graph is residual by default: on forward arcs only the greedy solvers can miss
+    the optimum, or report a feasible instance as infeasible.
+    Raises ValueError naming the line of any malformed or inconsistent input.
+    """
+    num_nodes = num_arcs = None
+    supplies = {}
+    tails, heads, capacities, costs = array('q'), array('q'), array('q'), array('q')
+    cost_offset = 0
+
+    with open(filename, 'r') as f:
+        for line_number, line in enumerate(f, 1):
+            fields = line.split()
+            if not fields or fields[0] == 'c':
+                continue
+            kind = fields[0]
+
+            if kind == 'p':
+                if num_nodes is not None:
+                    raise _line_error(filename, line_number, line, "duplicate problem line")
+                if len(fields) != 4 or fields[1] != 'min' or not (fields[2].isdigit() and fields[3].isdigit()):
+                    raise _line_error(filename, line_number, line, "expected 'p min <nodes> <arcs>'")
+                num_nodes, num_arcs = int(fields[2]), int(fields[3])
+                continue
+            if num_nodes is None:
+                raise _line_error(filename, line_number, line, "expected the problem line first")
+
+            try:
+                values = [int(value) for value in fields[1:]]
+            except ValueError:
+                raise _line_error(filename, line_number, line, "expected integers") from None
+
+            if kind == 'n':
+                if len(values) != 2:
+                    raise _line_error(filename, line_number, line, "expected 'n <id> <supply>'")
+                node, supply = values
+                if not 1 <= node <= num_nodes:
+                    raise _line_error(filename, line_number, line, f"node id outside 1..{num_nodes}")
+                supplies[node] = supplies.get(node, 0) + supply
+            elif kind == 'a':
+                if len(values) != 5:
+                    raise _line_error(filename, line_number, line, "expected 'a <tail> <head> <lower bound> <capacity> <cost>'")
+                u, v, lower, capacity, cost = values
+                if not (1 <= u <= num_nodes and 1 <= v <= num_nodes):
+                    raise _line_error(filename, line_number, line, f"node id outside 1..{num_nodes}")
+                if not 0 <= lower <= capacity:
+                    raise _line_error(filename, line_number, line, "expected 0 <= lower bound <= capacity")
+                if lower:
+                    # Pre-send the lower bound: it leaves u and arrives at v
+                    supplies[u] = supplies.get(u, 0) - lower
+                    supplies[v] = supplies.get(v, 0) + lower
+                    cost_offset += lower * cost
+                tails.append(u)
+                heads.append(v)
+                capacities.append(capacity - lower)
+                costs.append(cost)
+            else:
+                raise _line_error(filename, line_number, line, f"unknown line type '{kind}'")
+
+    if num_nodes is None:
+        raise ValueError(f"{filename}: missing 'p min' problem line")
+    if len(tails) != num_arcs:
+        raise ValueError(f"{filename}: problem line declares {num_arcs} arcs, found {len(tails)}")
+    if sum(supplies.values()) != 0:
+        raise ValueError(f"{filename}: supplies do not sum to zero")
+
+    sources = [node for node, supply in sorted(supplies.items()) if supply > 0]
+    sinks = [node for node, supply in sorted(supplies.items()) if supply < 0]
+    demand = sum(supplies[node] for node in sources)
+
+    if not sources:
+        source = sink = None  # A circulation: no super source or sink to attach
+    elif len(sources) == 1 and len(sinks) == 1:
+        source, sink = sources[0], sinks[0]
+    else:
+        source, sink = 0, num_nodes + 1
+        for node in sources:
+            tails.append(source)
+            heads.append(node)
+            capacities.append(supplies[node])
+            costs.append(0)
+        for node in sinks:
+            tails.append(node)
+            heads.append(sink)
+            capacities.append(-supplies[node])
+            costs.append(0)
+
+    graph = CSRGraph.from_arrays(tails, heads, capacities, costs, residual)
+    print(f"Graph loaded successfully from {filename}")
+    return DimacsInstance(graph, source, sink, demand, cost_offset, supplies)
+
+
+# ----------------- Writer ----------------- #
+def write_dimacs_min(graph, file_path, supplies=None, source=None, sink=None, demand=0):
+    """
+    Writes the forward edges of a graph as a DIMACS .min file.
+
+    Node labels are renumbered 1..n in sorted order. Supplies come from the supplies
+    dict (label -> supply) or, failing that, from source/sink/demand.
+    Returns the label -> DIMACS id mapping.
+    """
+    from graph_io import edge_columns
+
+    tails, heads, capacities, costs = edge_columns(graph)
+    labels = sorted(set(tails).union(heads, supplies or (), [node for node in (source, sink) if node is not None]))
+    ids = {label: i for i, label in enumerate(labels, 1)}
+
+    if supplies is None:
+        supplies = {}
+        if demand:
+            supplies[source] = demand
+            supplies[sink] = -demand
+
+    folder_path = os.path.dirname(file_path)
+    if folder_path:
+        os.makedirs(folder_path, exist_ok=True)
+    with open(file_path, 'w') as f:
+        f.write(f"p min {len(labels)} {len(tails)}\n")
+        for label in labels:
+            if supplies.get(label):
+                f.write(f"n {ids[label]} {supplies[label]}\n")
+        for u, v, capacity, cost in zip(tails, heads, capacities, costs):
+            f.write(f"a {ids[u]} {ids[v]} 0 {capacity} {cost}\n")
+    return ids
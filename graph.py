@@ -8,12 +8,22 @@ class Edge:
         self.cost = cost
         self.flow = 0
         self.reverse_edge = None
+        self.index = None
 
 
 class Graph:
-    def __init__(self):
+    def __init__(self, residual=False):
+        """
+        residual=False keeps only forward edges in adjacency_list.
+        residual=True also lists every backward arc, so searches can cancel flow.
+        In both modes arcs[2k] and arcs[2k + 1] hold the k-th forward edge and its backward arc.
+        """
         self.adjacency_list = defaultdict(list)
         self.edges = []
+        self.arcs = []
+        self.residual = residual
+        self._analyses = {}
+        self._capacities = []  # Original capacity of every arc, indexed like arcs
 
     def add_edge(self, from_node, to_node, capacity, cost):
         forward_edge = Edge(from_node, to_node, capacity, cost)
@@ -22,12 +32,50 @@ class Graph:
         forward_edge.reverse_edge = backward_edge
         backward_edge.reverse_edge = forward_edge
 
+        forward_edge.index = len(self.arcs)
+        backward_edge.index = forward_edge.index + 1
+        self.arcs.append(forward_edge)
+        self.arcs.append(backward_edge)
+        self._capacities.append(capacity)
+        self._capacities.append(0)
+
         self.adjacency_list[from_node].append(forward_edge)
+        if self.residual:
+            self.adjacency_list[to_node].append(backward_edge)
         self.edges.append(forward_edge)
+        self._analyses.clear()  # Cached LCC/degree analysis no longer matches the topology
+        return forward_edge
+
+    def analysis(self, lcc_mode="reachable"):
+        """Cached GraphAnalysis (LCC, degrees, source/sink) for the current topology."""
+        if lcc_mode not in self._analyses:
+            from graph_analysis import GraphAnalysis
+            self._analyses[lcc_mode] = GraphAnalysis(self, lcc_mode)
+        return self._analyses[lcc_mode]
+
+    def reset_flows(self):
+        """
+        Restores every arc's original capacity and zero flow, so the next solver
+        can reuse this graph instead of a deep copy. Topology and cached analyses are kept.
+        """
+        for edge, capacity in zip(self.arcs, self._capacities):
+            edge.capacity = capacity
+            edge.flow = 0
+
+    @property
+    def residual_edges(self):
+        """Edges a residual search should scan: every arc in residual mode, the forward edges otherwise."""
+        return self.arcs if self.residual else self.edges
 
     def get_neighbors(self, node):
         return self.adjacency_list[node]
 
+    def out_edges(self, node):
+        """Forward edges leaving node, skipping backward arcs in residual mode."""
+        if self.residual:
+            return [edge for edge in self.adjacency_list[node] if edge.index % 2 == 0]
+        return self.adjacency_list[node]
+
     def print_graph(self):
         for node, edges in self.adjacency_list.items():
             for edge in edges:
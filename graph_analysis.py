@@ -0,0 +1,70 @@
+from collections import defaultdict
+
+from connectivity import largest_component
+
+
+class GraphAnalysis:
+    """
+    Per-graph preprocessing shared by the whole simulation pipeline: the largest
+    connected component, degree tables, LCC metrics and the source/sink choice.
+    Each item is computed on first use and then reused.
+
+    Get one through graph.analysis(lcc_mode); the graph drops it when edges are added.
+    """
+
+    def __init__(self, graph, lcc_mode="reachable"):
+        self.graph = graph
+        self.lcc_mode = lcc_mode
+        self._lcc = None
+        self._degrees = None
+        self._metrics = None
+        self._sink = None
+
+    @property
+    def lcc(self):
+        if self._lcc is None:
+            self._lcc = largest_component(self.graph, self.lcc_mode)
+        return self._lcc
+
+    @property
+    def out_degree(self):
+        return self._degree_tables()[0]
+
+    @property
+    def in_degree(self):
+        return self._degree_tables()[1]
+
+    def _degree_tables(self):
+        if self._degrees is None:
+            out_degree = defaultdict(int)
+            in_degree = defaultdict(int)
+            for edge in self.graph.edges:
+                out_degree[edge.from_node] += 1
+                in_degree[edge.to_node] += 1
+            self._degrees = (out_degree, in_degree)
+        return self._degrees
+
+    @property
+    def metrics(self):
+        """|VLCC|, max out/in degree and density of the LCC, as written to the fmax results."""
+        if self._metrics is None:
+            from utility import lcc_metrics
+
+            self._metrics = lcc_metrics(self.lcc, self.out_degree, self.in_degree)
+        return self._metrics
+
+    @property
+    def density(self):
+        return self.metrics['k(LCC)']
+
+    @property
+    def source(self):
+        return self.lcc[0]
+
+    @property
+    def sink(self):
+        if self._sink is None:
+            from utility import bfs_farthest_node
+
+            self._sink = bfs_farthest_node(self.graph, self.source)
+        return self._sink
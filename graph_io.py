@@ -0,0 +1,239 @@
+"""
+Binary CSR container for large graphs.
+
+A binary graph file holds the same edges as the text edge list
+("u v capacity cost" per line), already laid out as the arrays of a CSRGraph,
+as fixed-width little-endian columns:
+
+    header   magic b"MCFG", uint16 version, uint8 node id width, uint8 value width,
+             uint64 number of nodes n, uint64 number of edges m      (24 bytes)
+    columns  labels                       n     (node id width: 4 or 8 bytes each)
+             first_out                    n + 1 (8 bytes each)
+             first_back                   n     (8 bytes each)
+             head, tail, rev              2m    (4 bytes each)
+             base_capacity, cost          2m    (value width: 4 or 8 bytes each)
+             forward_arcs                 m     (4 bytes each)
+
+Every column is padded to a multiple of 8 bytes. Loading maps the file and wraps
+memoryview casts of the columns straight into a CSRGraph, so the topology is
+neither parsed nor copied; only the mutable capacity and flow buffers are.
+Version 1 files, which held the tails, heads, capacities and costs edge columns,
+are still read.
+"""
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+MAGIC = b"MCFG"
+VERSION = 2
+_EDGE_COLUMNS_VERSION = 1
+_HEADER = struct.Struct("<4sHBBQQ")
+_TYPECODES = {4: 'i', 8: 'q'}
+_INT32_MIN, _INT32_MAX = -2 ** 31, 2 ** 31 - 1
+
+
+def _width(*columns):
+    """4 if every value fits in an int32, else 8."""
+    for column in columns:
+        if len(column) and (min(column) < _INT32_MIN or max(column) > _INT32_MAX):
+            return 8
+    return 4
+
+
+def _column_bytes(column, typecode):
+    data = array(typecode, column)
+    if sys.byteorder != 'little':
+        data.byteswap()
+    raw = data.tobytes()
+    return raw + bytes(-len(raw) % 8)
+
+
+def _padded(size):
+    return size + (-size % 8)
+
+
+def _layout(version, n, m, id_width, value_width):
+    """(name, typecode, length) of every column of a file, in file order."""
+    ids, values = _TYPECODES[id_width], _TYPECODES[value_width]
+    if version == _EDGE_COLUMNS_VERSION:
+        return [("tails", ids, m), ("heads", ids, m), ("capacities", values, m), ("costs", values, m)]
+    return [("labels", ids, n), ("first_out", 'q', n + 1), ("first_back", 'q', n),
+            ("head", 'i', 2 * m), ("tail", 'i', 2 * m), ("rev", 'i', 2 * m),
+            ("base_capacity", values, 2 * m), ("cost", values, 2 * m), ("forward_arcs", 'i', m)]
+
+
+def edge_columns(graph):
+    """
+    (tails, heads, capacities, costs) of a Graph, CSRGraph or generator DirectedGraph.
+    """
+    if hasattr(graph, 'edges'):
+        edges = graph.edges
+        return ([e.from_node for e in edges], [e.to_node for e in edges],
+                [e.capacity for e in edges], [e.cost for e in edges])
+
+    tails, heads, capacities, costs = [], [], [], []
+    for u, neighbors in graph.graph.items():
+        for edge in neighbors:
+            tails.append(u)
+            heads.append(edge['to'])
+            capacities.append(edge['capacity'])
+            costs.append(edge['cost'])
+    return tails, heads, capacities, costs
+
+
+# ----------------- Writing ----------------- #
+def save_csr_graph_binary(graph, file_path):
+    """
+    Writes the arrays of a CSRGraph to a binary graph file.
+    """
+    id_width = _width(graph.labels)
+    value_width = _width(graph.base_capacity, graph.cost)
+    n, m = graph.num_nodes, graph.num_edges
+
+    folder_path = os.path.dirname(file_path)
+    if folder_path:
+        os.makedirs(folder_path, exist_ok=True)
+    with open(file_path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, id_width, value_width, n, m))
+        for name, typecode, _ in _layout(VERSION, n, m, id_width, value_width):
+            f.write(_column_bytes(getattr(graph, name), typecode))
+
+
+def save_edge_columns_binary(tails, heads, capacities, costs, file_path):
+    """
+    Writes four equally long edge columns to a binary graph file.
+    """
+    from csr_graph import CSRGraph
+
+    save_csr_graph_binary(CSRGraph.from_arrays(tails, heads, capacities, costs), file_path)
+
+
+def save_graph_binary(graph, file_path):
+    """
+    Writes the forward edges of a graph to a binary graph file.
+    """
+    from csr_graph import CSRGraph
+
+    if isinstance(graph, CSRGraph):
+        save_csr_graph_binary(graph, file_path)
+    else:
+        save_edge_columns_binary(*edge_columns(graph), file_path)
+
+
+# ----------------- Reading ----------------- #
+def is_binary_graph_file(file_path):
+    """True if the file starts with the binary graph magic."""
+    with open(file_path, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def read_binary_header(file_path):
+    """
+    Returns (num_nodes, num_edges, id_width, value_width) of a binary graph file.
+    """
+    with open(file_path, 'rb') as f:
+        return _unpack_header(f.read(_HEADER.size), file_path)[1:]
+
+
+def _unpack_header(data, file_path):
+    if len(data) < _HEADER.size:
+        raise ValueError(f"{file_path} is too short to be a binary graph file")
+    magic, version, id_width, value_width, num_nodes, num_edges = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError(f"{file_path} is not a binary graph file")
+    if version not in (_EDGE_COLUMNS_VERSION, VERSION):
+        raise ValueError(f"{file_path} has unsupported binary graph version {version}")
+    if id_width not in _TYPECODES or value_width not in _TYPECODES:
+        raise ValueError(f"{file_path} has invalid column widths {id_width}/{value_width}")
+    return version, num_nodes, num_edges, id_width, value_width
+
+
+def _map_columns(file_path):
+    """
+    Maps a binary graph file and returns (version, columns), columns being a dict of
+    memoryviews over the mapping. The mapping stays open as long as any column is alive.
+    """
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            raise ValueError(f"{file_path} is too short to be a binary graph file")
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    buffer = memoryview(mapping)
+    version, n, m, id_width, value_width = _unpack_header(buffer[:_HEADER.size], file_path)
+    layout = _layout(version, n, m, id_width, value_width)
+    expected = _HEADER.size + sum(_padded(length * array(typecode).itemsize) for _, typecode, length in layout)
+    if size < expected:
+        raise ValueError(f"{file_path} is truncated: expected {expected} bytes, found {size}")
+
+    columns = {}
+    offset = _HEADER.size
+    for name, typecode, length in layout:
+        nbytes = length * array(typecode).itemsize
+        raw = buffer[offset:offset + nbytes]
+        if sys.byteorder == 'little':
+            columns[name] = raw.cast(typecode)
+        else:
+            column = array(typecode, raw.tobytes())
+            column.byteswap()
+            columns[name] = column
+        offset += _padded(nbytes)
+    return version, columns
+
+
+def load_edge_columns_binary(file_path):
+    """
+    Returns the (tails, heads, capacities, costs) columns of a binary graph file, in input order.
+    Version 1 columns are memoryviews over the mapping; the CSR layout is gathered from
+    the forward arcs in one pass.
+    """
+    version, columns = _map_columns(file_path)
+    if version == _EDGE_COLUMNS_VERSION:
+        return columns["tails"], columns["heads"], columns["capacities"], columns["costs"]
+
+    labels, tail, head = columns["labels"], columns["tail"], columns["head"]
+    capacity, cost, forward_arcs = columns["base_capacity"], columns["cost"], columns["forward_arcs"]
+    return (array('q', (labels[tail[a]] for a in forward_arcs)), array('q', (labels[head[a]] for a in forward_arcs)),
+            array('q', (capacity[a] for a in forward_arcs)), array('q', (cost[a] for a in forward_arcs)))
+
+
+def load_csr_graph_binary(file_path, residual=False):
+    """
+    Loads a binary graph file into a CSRGraph. The topology arrays are the mapped columns
+    themselves; version 1 edge columns are sorted into CSR order instead.
+    """
+    from csr_graph import CSRGraph
+
+    version, columns = _map_columns(file_path)
+    if version == _EDGE_COLUMNS_VERSION:
+        graph = CSRGraph.from_arrays(columns["tails"], columns["heads"], columns["capacities"], columns["costs"],
+                                     residual)
+    else:
+        graph = CSRGraph(residual=residual, **columns)
+    print(f"Graph loaded successfully from {file_path}")
+    return graph
+
+
+# ----------------- Conversion ----------------- #
+def convert_text_to_binary(text_path, binary_path):
+    """
+    Converts a "u v capacity cost" edge list to a binary graph file.
+    """
+    from utility import load_edge_columns_from_file
+
+    save_edge_columns_binary(*load_edge_columns_from_file(text_path), binary_path)
+
+
+def convert_binary_to_text(binary_path, text_path):
+    """
+    Converts a binary graph file back to a "u v capacity cost" edge list.
+    """
+    tails, heads, capacities, costs = load_edge_columns_binary(binary_path)
+    folder_path = os.path.dirname(text_path)
+    if folder_path:
+        os.makedirs(folder_path, exist_ok=True)
+    with open(text_path, 'w') as f:
+        for u, v, capacity, cost in zip(tails, heads, capacities, costs):
+            f.write(f"{u} {v} {capacity} {cost}\n")
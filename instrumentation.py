@@ -0,0 +1,90 @@
+"""
+Opt-in operation counters for the solvers.
+
+Every solver takes stats=None. When a SolverStats is passed it counts its work into
+it; with the default None each counter update sits behind an `if stats is not None`
+guard placed per node or per successful relaxation, never per arc, so an
+uninstrumented run does no extra work in its inner loops.
+"""
+import json
+import os
+import time
+
+# Counters in the order they are reported
+COUNTERS = (
+    "searches",       # Shortest-path / augmenting-path searches
+    "nodes_scanned",  # Nodes whose out-arcs a search examined
+    "arcs_scanned",   # Arcs examined by those scans
+    "relaxations",    # Arcs that improved a distance label
+    "heap_pushes",
+    "heap_pops",
+    "phases",         # Delta-phases (capacity scaling) or refine phases (cost scaling)
+    "augmentations",  # Flow pushes along a whole source-sink path or cycle
+    "pushes",         # Single-arc pushes (push-relabel)
+    "relabels",
+    "pivots",         # Basis changes (network simplex)
+)
+
+
+class SolverStats:
+    """
+    Operation counters and per-phase timings of one solver run.
+    phase_times holds (label, seconds) pairs, in the order the phases ran.
+    """
+
+    def __init__(self, algorithm=None):
+        self.algorithm = algorithm
+        for name in COUNTERS:
+            setattr(self, name, 0)
+        self.phase_times = []
+        self.total_time = 0.0
+        self._phase = None
+
+    def begin_phase(self, label):
+        """Closes the running phase, if any, and starts timing a new one."""
+        self.end_phase()
+        self.phases += 1
+        self._phase = (label, time.perf_counter())
+
+    def end_phase(self):
+        if self._phase is not None:
+            label, start = self._phase
+            self.phase_times.append((label, time.perf_counter() - start))
+            self._phase = None
+
+    def as_dict(self):
+        data = {"algorithm": self.algorithm}
+        data.update((name, getattr(self, name)) for name in COUNTERS)
+        data["phase_times"] = [[label, seconds] for label, seconds in self.phase_times]
+        data["total_time"] = self.total_time
+        return data
+
+    def __repr__(self):
+        counters = ", ".join(f"{name}={getattr(self, name)}" for name in COUNTERS if getattr(self, name))
+        return f"SolverStats({self.algorithm!r}, {counters}, total_time={self.total_time:.6f})"
+
+
+def run_with_stats(algorithm, graph, source, sink, demand, name=None, **kwargs):
+    """
+    Runs algorithm(graph, source, sink, demand, stats=..., **kwargs) with a fresh SolverStats.
+    Returns (result, stats), result being the solver's usual tuple.
+    """
+    stats = SolverStats(name or getattr(algorithm, "__name__", None))
+    start = time.perf_counter()
+    result = algorithm(graph, source, sink, demand, stats=stats, **kwargs)
+    stats.end_phase()
+    stats.total_time = time.perf_counter() - start
+    return result, stats
+
+
+def write_stats(records, file_path):
+    """
+    Writes a list of stats records (SolverStats or their as_dict() form, optionally
+    with extra keys such as the graph name) to file_path as JSON.
+    """
+    folder_path = os.path.dirname(file_path)
+    if folder_path:
+        os.makedirs(folder_path, exist_ok=True)
+    records = [record.as_dict() if isinstance(record, SolverStats) else record for record in records]
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump(records, f, indent=2)
@@ -1,5 +1,6 @@
-import copy
+import argparse
 import os
+from concurrent.futures import ProcessPoolExecutor
 
 
 # Graph Generation and Source-Sink Graph Tools
@@ -10,13 +11,16 @@ from capacity_scaling import capacity_scaling_with_metrics
 from successive_shortest_paths import successive_shortest_paths
 from successive_shortest_paths_capacity_scaling import successive_shortest_paths_capacity_scaling
 from primal_dual_algorithm import primal_dual_algorithm
+from cost_scaling import cost_scaling
+from network_simplex import network_simplex
+from max_flow import maximum_flow
+from instrumentation import run_with_stats, write_stats
+from results_writer import ResultWriter, format_algorithm_row, format_ford_fulkerson_row
 
 # Utility Functions
 from utility import (
     load_graph_from_file,
-    find_largest_connected_component,
-    bfs_farthest_node,
-    run_ford_fulkerson_and_write_results,
+    write_ford_fulkerson_results,
     print_results
 )
 
@@ -43,108 +47,229 @@ parameter_sets_simulation2 = [
     (250, 0.35, 128, 40)
 ]
 
-# Generate Graph Files
-generate_graphs_for_simulation(parameter_sets_simulation1, "Simulation1")
-generate_graphs_for_simulation(parameter_sets_simulation2, "Simulation2")
-
 # Define directories for simulation files
 simulation1_dir = "./Graphs/Simulation1"
 simulation2_dir = "./Graphs/Simulation2"
 
-# Create Results directory
-os.makedirs("./Results", exist_ok=True)
-
 # Define result file paths with simulation-specific prefixes
 result_file1_simulation1 = os.path.join("./Results", "simulation_one_ford_fulkerson_results.txt")
 result_file2_simulation1 = os.path.join("./Results", "simulation_one_algorithms_results.txt")
 result_file1_simulation2 = os.path.join("./Results", "simulation_two_ford_fulkerson_results.txt")
 result_file2_simulation2 = os.path.join("./Results", "simulation_two_algorithms_results.txt")
 
-# Determine the maximum filename length for each simulation
-max_filename_length1 = max(len(filename) for filename in os.listdir(simulation1_dir))
-max_filename_length2 = max(len(filename) for filename in os.listdir(simulation2_dir))
+# Operation counters per (graph, algorithm), written only with --stats
+stats_file_simulation1 = os.path.join("./Results", "simulation_one_solver_stats.json")
+stats_file_simulation2 = os.path.join("./Results", "simulation_two_solver_stats.json")
+
+# Result file format: "text" (fixed-width tables), "csv" or "sqlite" (typed columns, see results_writer)
+results_format = "text"
+results_extensions = {"text": ".txt", "csv": ".csv", "sqlite": ".db"}
 
 # Format headers with dynamic spacing
 ford_header_format =  f"{{:<10}}\t{{:<5}}\t{{:<5}}\t{{:<10}}\t{{:<10}}\t{{:<10}}\t{{:<10}}\t{{:<12}}\t{{:<12}}\t{{:<11}}\n"
-algo_header_format = f"{{:<15}}\t{{:<15}}\t{{:<9}}\t{{:<12}}\t{{:<10}}\t{{:<10}}\t{{:<10}}"
+algo_header_format = f"{{:<15}}\t{{:<15}}\t{{:<9}}\t{{:<12}}\t{{:<10}}\t{{:<10}}\t{{:<10}}\t{{:<10}}"
 
-# Create result files with headers for Simulation1
-with open(result_file1_simulation1, 'w', encoding='utf-8') as results:
-    results.write(ford_header_format.format("Graph", "n", "r", "upperCap", "upperCost", "fmax", "|VLCC|", "∆out(LCC)", "∆in(LCC)", "k(LCC)"))
+# LCC semantics used for source selection and metrics ("reachable", "dfs", "scc" or "wcc")
+lcc_mode = "reachable"
 
-with open(result_file2_simulation1, 'w', encoding='utf-8') as results:
-    results.write(algo_header_format.format("Algorithm", "Graph", "f", "MC", "paths", "ML", "MPL"))
-    results.write("\n")
+# MPL denominator of every algorithm ("nodes", "eccentricity" or "condensation", see path_metrics)
+mpl_mode = "nodes"
 
-# Create result files with headers for Simulation2
-with open(result_file1_simulation2, 'w', encoding='utf-8') as results:
-    results.write(
-        ford_header_format.format("Graph", "n", "r", "upperCap", "upperCost", "fmax", "|VLCC|", "∆out(LCC)", "∆in(LCC)", "k(LCC)"))
+# Load graphs with their paired backward arcs, so every algorithm can cancel flow and returns a
+# minimum-cost flow. With False, SSP/CS/SSPCS/PD only use the forward edges and are greedy; the
+# Arcs column of the results says which arcs each row's algorithm could use.
+residual_graphs = False
 
-with open(result_file2_simulation2, 'w', encoding='utf-8') as results:
-    results.write(algo_header_format.format("Algorithm", "Graph", "f", "MC", "paths", "ML", "MPL"))
-    results.write("\n")
+# Engine for fmax ("edmonds_karp", "dinic" or "push_relabel"); all return the same value
+max_flow_method = "push_relabel"
 
 # Algorithm identifiers
 algo_ssp = "SSP"
 algo_cs = "CS"
 algo_sspcs = "SSPCS"
 algo_pd = "PD"
-
-# Process Simulation1
-def process_simulation(simulation_dir, result_file1, result_file2, simulation_number):
-    graph_number = 1
-    for filename in os.listdir(simulation_dir):
-        file_path = os.path.join(simulation_dir, filename)
-
-        # Load graph
-        graph = load_graph_from_file(file_path)
-
-        # Find the largest connected component (LCC)
-        lcc = find_largest_connected_component(graph)
-
-        # Determine source and sink nodes
-        source = lcc[0]  # Start node from LCC
-        sink = bfs_farthest_node(graph, source)
-
-        print(f"Simulation {simulation_number} - Source:{source}")
-        print(f"Simulation {simulation_number} - Sink:{sink}")
-
-        # Create deep copies of graph for each algorithm
-        graph_copy_ssp = copy.deepcopy(graph)
-        graph_copy_cs = copy.deepcopy(graph)
-        graph_copy_sspcs = copy.deepcopy(graph)
-        graph_copy_pd = copy.deepcopy(graph)
-
-        # Run algorithm and write results
-        fmax = run_ford_fulkerson_and_write_results(graph, source, sink, result_file1, filename)
+algo_cost_scaling = "COST-SCALING"
+algo_network_simplex = "NETWORK-SIMPLEX"
+
+# Algorithms run on every graph, in the order their results are written
+algorithms = {
+    algo_ssp: successive_shortest_paths,
+    algo_cs: capacity_scaling_with_metrics,
+    algo_sspcs: successive_shortest_paths_capacity_scaling,
+    algo_pd: primal_dual_algorithm,
+    algo_cost_scaling: cost_scaling,
+    algo_network_simplex: network_simplex,
+}
+
+# Algorithms that always solve on the full residual graph, whatever the graph's mode
+residual_algorithms = {algo_cost_scaling, algo_network_simplex}
+
+
+def arcs_used(algo, residual):
+    """The arcs algo can send flow on ("residual" or "forward") when graphs are loaded in this residual mode."""
+    return "residual" if residual or algo in residual_algorithms else "forward"
+
+
+# ----------------- Jobs ----------------- #
+# Most recently loaded graph of this process, reused by consecutive jobs on the same file
+_graph_cache = {}
+
+
+def load_graph(file_path, residual=False):
+    """
+    Loads a graph with its source/sink analysis, or hands back the cached one with its flows reset.
+    """
+    graph = _graph_cache.get((file_path, residual))
+    if graph is not None:
+        graph.reset_flows()
+        return graph
+
+    graph = load_graph_from_file(file_path, residual)
+    graph.analysis(lcc_mode).sink  # LCC and BFS are part of the topology, not the flow state
+    _graph_cache.clear()
+    _graph_cache[(file_path, residual)] = graph
+    return graph
+
+
+def prepare_graph(file_path, residual=False):
+    """
+    Loads a graph, picks source and sink and computes fmax.
+    Returns (source, sink, fmax, metrics).
+    """
+    graph = load_graph(file_path, residual)
+    analysis = graph.analysis(lcc_mode)
+    fmax = maximum_flow(graph, analysis.source, analysis.sink, max_flow_method)
+    return analysis.source, analysis.sink, fmax, analysis.metrics
+
+
+def run_algorithm(file_path, algo, demand, collect_stats=False, residual=False):
+    """
+    Runs one min-cost flow algorithm on the graph with its flows reset.
+    Returns ((flow, cost, paths, ml, mpl), stats), stats being the solver's
+    SolverStats as a dict when collect_stats is set and None otherwise.
+    """
+    graph = load_graph(file_path, residual)
+    analysis = graph.analysis(lcc_mode)
+    if not collect_stats:
+        return algorithms[algo](graph, analysis.source, analysis.sink, demand, mpl_mode=mpl_mode), None
+
+    result, stats = run_with_stats(algorithms[algo], graph, analysis.source, analysis.sink, demand, algo,
+                                   mpl_mode=mpl_mode)
+    record = stats.as_dict()
+    record["graph"] = os.path.basename(file_path)
+    return result, record
+
+
+def run_jobs(function, jobs, workers, chunksize=1):
+    """
+    Runs function(*job) for every job, in a process pool when workers > 1.
+    Results come back in job order, whichever job finishes first.
+    Consecutive jobs in one chunk run in the same process.
+    """
+    if workers <= 1:
+        return [function(*job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(function, *zip(*jobs), chunksize=chunksize))
+
+
+def result_path(file_path, results_format):
+    return os.path.splitext(file_path)[0] + results_extensions[results_format]
+
+
+def start_result_file(file_path, header, results_format):
+    """Starts a result file afresh: text files get their header line, CSV/SQLite writers add their own."""
+    file_path = result_path(file_path, results_format)
+    if results_format == "text":
+        with open(file_path, 'w', encoding='utf-8') as results:
+            results.write(header)
+    elif os.path.exists(file_path):
+        os.remove(file_path)
+
+
+# Process Simulation
+def process_simulation(simulation_dir, result_file1, result_file2, simulation_number, workers=1, stats_file=None,
+                       results_format="text", residual=False):
+    filenames = sorted(os.listdir(simulation_dir))
+    file_paths = [os.path.join(simulation_dir, filename) for filename in filenames]
+    if not file_paths:
+        return
+
+    # Rows are buffered and written once per result file
+    ford_writer = ResultWriter(result_path(result_file1, results_format), format_ford_fulkerson_row, "ford_fulkerson")
+    algo_writer = ResultWriter(result_path(result_file2, results_format), format_algorithm_row, "algorithms")
+
+    # Preprocess every graph: source, sink, fmax and LCC metrics
+    prepared = run_jobs(prepare_graph, [(file_path, residual) for file_path in file_paths], workers)
+
+    demands = []
+    for filename, (source, sink, fmax, metrics) in zip(filenames, prepared):
+        write_ford_fulkerson_results(fmax, metrics, None, filename, ford_writer)
         demand = 0.95 * fmax
+        demands.append(demand)
 
+        print(f"Simulation {simulation_number} - {filename} - Source:{source}")
+        print(f"Simulation {simulation_number} - {filename} - Sink:{sink}")
         print(f"Simulation {simulation_number} - Max flow using Ford Fulkerson = {fmax}")
         print(f"Simulation {simulation_number} - Demand = {demand}")
         print()
 
-        # Run and print results for each algorithm
-        flow, cost, paths, ml, mpl = successive_shortest_paths(graph_copy_ssp, source, sink, demand)
-        print_results(flow, cost, paths, ml, mpl, result_file2, algo_ssp, filename)
-
-        flow, cost, paths, ml, mpl = capacity_scaling_with_metrics(graph_copy_cs, source, sink, demand)
-        print_results(flow, cost, paths, ml, mpl, result_file2, algo_cs, filename)
-
-        flow, cost, paths, ml, mpl = successive_shortest_paths_capacity_scaling(graph_copy_sspcs, source, sink, demand)
-        print_results(flow, cost, paths, ml, mpl, result_file2, algo_sspcs, filename)
-
-        # Run Primal-Dual Algorithm
-        flow, cost, paths, ml, mpl = primal_dual_algorithm(graph_copy_pd, source, sink, demand)
-        print_results(flow, cost, paths, ml, mpl, result_file2, algo_pd, filename)
-
-        with open(result_file2, 'a', encoding='utf-8') as results:
-            results.write("-" * 110 + "\n")
-
-        graph_number += 1
-
-# Process both simulations
-process_simulation(simulation1_dir, result_file1_simulation1, result_file2_simulation1, 1)
-process_simulation(simulation2_dir, result_file1_simulation2, result_file2_simulation2, 2)
-
-print("Simulation processing completed.")
\ No newline at end of file
+    # Run every (graph, algorithm) pair
+    jobs = [(file_path, algo, demand, stats_file is not None, residual)
+            for file_path, demand in zip(file_paths, demands)
+            for algo in algorithms]
+    # One chunk per graph, so each worker loads a graph once and resets its flows between algorithms
+    results = run_jobs(run_algorithm, jobs, workers, chunksize=len(algorithms))
+
+    # Write results in graph order, then algorithm order
+    records = iter(results)
+    for filename in filenames:
+        for algo in algorithms:
+            (flow, cost, paths, ml, mpl), _ = next(records)
+            print_results(flow, cost, paths, ml, mpl, None, algo, filename, algo_writer, arcs_used(algo, residual))
+        if algo_writer.kind == "text":
+            algo_writer.add_line("-" * 110)
+
+    ford_writer.flush()
+    algo_writer.flush()
+
+    if stats_file is not None:
+        write_stats([stats for _, stats in results], stats_file)
+
+
+def main(workers=1, collect_stats=False, results_format=results_format, residual=residual_graphs):
+    # Generate Graph Files
+    generate_graphs_for_simulation(parameter_sets_simulation1, "Simulation1")
+    generate_graphs_for_simulation(parameter_sets_simulation2, "Simulation2")
+
+    # Create Results directory
+    os.makedirs("./Results", exist_ok=True)
+
+    # Create result files (with headers for text) for both simulations
+    ford_header = ford_header_format.format("Graph", "n", "r", "upperCap", "upperCost", "fmax", "|VLCC|", "∆out(LCC)", "∆in(LCC)", "k(LCC)")
+    algo_header = algo_header_format.format("Algorithm", "Graph", "f", "MC", "paths", "ML", "MPL", "Arcs") + "\n"
+    for result_file1, result_file2 in ((result_file1_simulation1, result_file2_simulation1),
+                                       (result_file1_simulation2, result_file2_simulation2)):
+        start_result_file(result_file1, ford_header, results_format)
+        start_result_file(result_file2, algo_header, results_format)
+
+    # Process both simulations
+    process_simulation(simulation1_dir, result_file1_simulation1, result_file2_simulation1, 1, workers,
+                       stats_file_simulation1 if collect_stats else None, results_format, residual)
+    process_simulation(simulation2_dir, result_file1_simulation2, result_file2_simulation2, 2, workers,
+                       stats_file_simulation2 if collect_stats else None, results_format, residual)
+
+    print("Simulation processing completed.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the min-cost flow simulations.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="worker processes for (graph, algorithm) jobs; 1 runs everything in-process")
+    parser.add_argument("--stats", action="store_true",
+                        help="count solver operations and write them to Results/*_solver_stats.json")
+    parser.add_argument("--results-format", choices=sorted(results_extensions), default=results_format,
+                        help="text tables, or typed CSV/SQLite rows")
+    parser.add_argument("--residual", action="store_true", default=residual_graphs,
+                        help="load graphs with backward arcs, so every algorithm returns a minimum-cost flow")
+    args = parser.parse_args()
+    main(args.workers, args.stats, args.results_format, args.residual)
@@ -0,0 +1,270 @@
+"""
+Maximum flow on array-backed residual storage.
+
+Both engines work on the same flat layout: nodes 0..n-1, the arcs of node u are
+first[u]..first[u + 1] - 1, and every arc a has a paired reverse arc rev[a].
+Only the forward edges of the graph carry capacity; their reverse arcs start at 0.
+"""
+from collections import deque
+
+
+def residual_arrays(graph):
+    """
+    Builds (ids, first, head, rev, capacity, cost) from the forward edges of a Graph or CSRGraph.
+    ids maps labels to node numbers (None for a CSRGraph, which has its own node_index).
+    """
+    from csr_graph import CSRGraph
+
+    if isinstance(graph, CSRGraph):
+        # Already laid out per node as forward arcs, then backward arcs
+        ids = None
+        capacity = [0] * len(graph.head)
+        for a in graph.forward_arcs:
+            capacity[a] = graph.capacity[a]
+        return ids, list(graph.first_out), list(graph.head), list(graph.rev), capacity, list(graph.cost)
+
+    ids = {}
+    for edge in graph.edges:
+        for node in (edge.from_node, edge.to_node):
+            if node not in ids:
+                ids[node] = len(ids)
+    n = len(ids)
+
+    degree = [0] * (n + 1)
+    for edge in graph.edges:
+        degree[ids[edge.from_node]] += 1
+        degree[ids[edge.to_node]] += 1
+    first = [0] * (n + 1)
+    for i in range(n):
+        first[i + 1] = first[i] + degree[i]
+
+    m2 = first[n]
+    head = [0] * m2
+    rev = [0] * m2
+    capacity = [0] * m2
+    cost = [0] * m2
+    position = first[:n]
+    for edge in graph.edges:
+        u, v = ids[edge.from_node], ids[edge.to_node]
+        a = position[u]
+        position[u] += 1
+        b = position[v]  # After the increment, so a self-loop gets two distinct arcs
+        position[v] += 1
+        head[a], rev[a], capacity[a], cost[a] = v, b, edge.capacity, edge.cost
+        head[b], rev[b], cost[b] = u, a, -edge.cost
+    return ids, first, head, rev, capacity, cost
+
+
+def node_ids(graph, ids, source, sink):
+    """Node numbers of source and sink in the residual_arrays layout (None if absent)."""
+    if ids is None:
+        return graph.node_index(source), graph.node_index(sink)
+    return ids.get(source), ids.get(sink)
+
+
+def node_labels(graph, ids):
+    """Inverse of the residual_arrays numbering, as a function from node number to label."""
+    if ids is None:
+        return graph.node_label
+    return list(ids).__getitem__
+
+
+# ----------------- Dinic ----------------- #
+def dinic(graph, source, sink):
+    """
+    Dinic's algorithm: BFS level graphs, each saturated by a blocking flow.
+    Returns the maximum flow value.
+    """
+    ids, first, head, rev, capacity, _ = residual_arrays(graph)
+    s, t = node_ids(graph, ids, source, sink)
+    if s is None or t is None or s == t:
+        return 0
+
+    n = len(first) - 1
+    max_flow = 0
+    while True:
+        # Level graph
+        level = [-1] * n
+        level[s] = 0
+        queue = deque([s])
+        while queue and level[t] == -1:
+            u = queue.popleft()
+            for a in range(first[u], first[u + 1]):
+                v = head[a]
+                if level[v] == -1 and capacity[a] > 0:
+                    level[v] = level[u] + 1
+                    queue.append(v)
+        if level[t] == -1:
+            return max_flow
+
+        # Blocking flow along an explicit path with current-arc pointers
+        current = first[:n]
+        path = []
+        u = s
+        while True:
+            if u == t:
+                path_flow = min(capacity[a] for a in path)
+                for a in path:
+                    capacity[a] -= path_flow
+                    capacity[rev[a]] += path_flow
+                max_flow += path_flow
+                del path[next(k for k, a in enumerate(path) if capacity[a] == 0):]
+                u = head[path[-1]] if path else s
+                continue
+
+            a = current[u]
+            end = first[u + 1]
+            while a < end and not (capacity[a] > 0 and level[head[a]] == level[u] + 1):
+                a += 1
+            current[u] = a
+
+            if a < end:
+                path.append(a)
+                u = head[a]
+            elif u == s:
+                break
+            else:
+                level[u] = -1  # Dead end
+                a = path.pop()
+                current[head[rev[a]]] = a + 1
+                u = head[rev[a]]
+
+
+# ----------------- Push-Relabel ----------------- #
+def push_relabel(graph, source, sink, global_relabel_frequency=1.0):
+    """
+    Highest-label push-relabel with the gap and global-relabel heuristics.
+    Only the first phase runs (a maximum preflow), which is enough for the flow value.
+    A global relabel is redone after about global_relabel_frequency * (n + m) relabel work.
+    Returns the maximum flow value.
+    """
+    ids, first, head, rev, capacity, _ = residual_arrays(graph)
+    s, t = node_ids(graph, ids, source, sink)
+    if s is None or t is None or s == t:
+        return 0
+
+    n = len(first) - 1
+    height = [n] * n
+    excess = [0] * n
+    current = first[:n]
+    active = [[] for _ in range(2 * n)]     # Active nodes by height
+    layers = [set() for _ in range(2 * n)]  # All nodes below n by height, for the gap heuristic
+
+    def global_relabel():
+        """Exact distances to the sink in the residual graph; nodes that cannot reach it get n."""
+        for h in range(n):
+            layers[h].clear()
+            active[h].clear()
+        for u in range(n):
+            height[u] = n
+        height[t] = 0
+        layers[0].add(t)
+        queue = deque([t])
+        while queue:
+            v = queue.popleft()
+            for b in range(first[v], first[v + 1]):
+                u = head[b]
+                if height[u] == n and u != s and capacity[rev[b]] > 0:
+                    height[u] = height[v] + 1
+                    layers[height[u]].add(u)
+                    queue.append(u)
+        height[s] = n
+        highest = 0
+        for u in range(n):
+            current[u] = first[u]
+            if excess[u] > 0 and u != t and height[u] < n:
+                active[height[u]].append(u)
+                highest = max(highest, height[u])
+        return highest
+
+    # Saturate every arc leaving the source
+    for a in range(first[s], first[s + 1]):
+        if capacity[a] > 0:
+            v = head[a]
+            excess[v] += capacity[a]
+            capacity[rev[a]] += capacity[a]
+            capacity[a] = 0
+
+    highest = global_relabel()
+    relabel_limit = global_relabel_frequency * (n + len(head))
+    work = 0
+
+    while highest >= 0:
+        if not active[highest]:
+            highest -= 1
+            continue
+        u = active[highest].pop()
+        if height[u] != highest or excess[u] <= 0:
+            continue  # Stale entry
+
+        # Discharge u
+        while excess[u] > 0:
+            a = current[u]
+            end = first[u + 1]
+            hu = height[u]
+            while a < end and not (capacity[a] > 0 and height[head[a]] == hu - 1):
+                a += 1
+            current[u] = a
+
+            if a < end:
+                v = head[a]
+                delta = min(excess[u], capacity[a])
+                capacity[a] -= delta
+                capacity[rev[a]] += delta
+                excess[u] -= delta
+                if excess[v] == 0 and v != t:
+                    active[hu - 1].append(v)
+                    if hu - 1 > highest:
+                        highest = hu - 1
+                excess[v] += delta
+                continue
+
+            # Relabel
+            old = hu
+            new = 2 * n
+            for b in range(first[u], first[u + 1]):
+                if capacity[b] > 0 and height[head[b]] + 1 < new:
+                    new = height[head[b]] + 1
+            work += first[u + 1] - first[u] + 12
+            layers[old].discard(u)
+
+            if not layers[old]:
+                # Gap: nothing above old can reach the sink any more
+                for h in range(old + 1, n):
+                    for w in layers[h]:
+                        height[w] = n
+                    layers[h].clear()
+                new = n
+            if new >= n:
+                height[u] = n
+                break
+            height[u] = new
+            layers[new].add(u)
+            current[u] = first[u]
+
+        if excess[u] > 0 and height[u] < n:
+            active[height[u]].append(u)
+            highest = max(highest, height[u])
+
+        if work > relabel_limit:
+            work = 0
+            highest = global_relabel()
+
+    return excess[t]
+
+
+# ----------------- Selection ----------------- #
+def maximum_flow(graph, source, sink, method="edmonds_karp"):
+    """
+    Maximum flow value from source to sink.
+    method: "edmonds_karp" (utility.ford_fulkerson_edmonds_karp), "dinic" or "push_relabel".
+    """
+    if method == "edmonds_karp":
+        from utility import ford_fulkerson_edmonds_karp
+
+        return ford_fulkerson_edmonds_karp(graph, source, sink)[0]
+    if method == "dinic":
+        return dinic(graph, source, sink)
+    if method == "push_relabel":
+        return push_relabel(graph, source, sink)
+    raise ValueError(f"Unknown max-flow method '{method}'")
@@ -0,0 +1,241 @@
+import math
+
+from path_metrics import PathLengthStats, path_length_metrics
+from utility import decompose_flow
+
+# Arc states: non-tree arcs sit at their upper or lower bound
+STATE_UPPER = -1
+STATE_TREE = 0
+STATE_LOWER = 1
+
+
+def _arc_arrays(graph, source, sink):
+    """
+    Numbers the nodes of the forward edges (plus source and sink) and copies the edges.
+    Self-loops are dropped, they cannot carry source-sink flow.
+    Returns (ids, tails, heads, capacities, costs).
+    """
+    ids = {}
+    tails, heads, capacities, costs = [], [], [], []
+    for node in (source, sink):
+        ids.setdefault(node, len(ids))
+    for edge in graph.edges:
+        u = ids.setdefault(edge.from_node, len(ids))
+        v = ids.setdefault(edge.to_node, len(ids))
+        if u != v:
+            tails.append(u)
+            heads.append(v)
+            capacities.append(edge.capacity)
+            costs.append(edge.cost)
+    return ids, tails, heads, capacities, costs
+
+
+# Network Simplex Algorithm
+def network_simplex(graph, source, sink, demand, block_size=None, stats=None, mpl_mode="nodes",
+                    path_stats=None):
+    """
+    Primal network simplex with a big-M artificial root.
+
+    The spanning-tree basis is kept in parent/pred/depth arrays plus a thread
+    (preorder successor) list, so a pivot only touches the cycle and the subtree
+    that is re-hung. Pricing is block search: arcs are scanned in blocks of
+    block_size (default sqrt(m)) and the most violating arc of the first block
+    that has one enters. All arithmetic stays integral for integral inputs.
+    stats: optional instrumentation.SolverStats counting pivots and priced arcs.
+    mpl_mode: MPL denominator, see path_metrics.
+    path_stats: path_metrics.PathLengthStats to accumulate the path lengths into, e.g. one with a
+        histogram or keep_paths=True; by default a plain one is used.
+    """
+    print("==== NETWORK SIMPLEX ====")
+    ids, tails, heads, capacities, costs = _arc_arrays(graph, source, sink)
+    s, t = ids[source], ids[sink]
+    n = len(ids)
+    m = len(tails)
+    root = n
+
+    supply = [0] * n
+    if demand > 0 and s != t:
+        supply[s] += demand
+        supply[t] -= demand
+
+    big_m = (n + 1) * (max((abs(c) for c in costs), default=0) + 1)
+    infinite = sum(capacities) + demand + 1
+    flow = [0] * m
+    state = [STATE_LOWER] * m
+
+    # Initial basis: every node hangs off the root through an artificial arc
+    parent = [root] * (n + 1)
+    pred = [0] * (n + 1)
+    depth = [1] * (n + 1)
+    potential = [0] * (n + 1)
+    thread = [u + 1 for u in range(n + 1)]
+    rev_thread = [u - 1 for u in range(n + 1)]
+    parent[root] = -1
+    depth[root] = 0
+    thread[n] = 0 if n else root
+    rev_thread[0] = root
+    for u in range(n):
+        pred[u] = len(tails)
+        if supply[u] >= 0:
+            tails.append(u)
+            heads.append(root)
+            flow.append(supply[u])
+            potential[u] = -big_m
+        else:
+            tails.append(root)
+            heads.append(u)
+            flow.append(-supply[u])
+            potential[u] = big_m
+        capacities.append(infinite)
+        costs.append(big_m)
+        state.append(STATE_TREE)
+
+    arc_count = len(tails)
+    if block_size is None:
+        block_size = max(10, int(math.sqrt(arc_count)))
+    next_arc = 0
+
+    while True:
+        # Block search pricing
+        entering = -1
+        best = 0
+        e = next_arc
+        scanned = 0
+        for priced in range(1, arc_count + 1):
+            violation = state[e] * (costs[e] + potential[tails[e]] - potential[heads[e]])
+            if violation < best:
+                best = violation
+                entering = e
+            e += 1
+            if e == arc_count:
+                e = 0
+            scanned += 1
+            if scanned == block_size:
+                if entering != -1:
+                    break
+                scanned = 0
+        if stats is not None:
+            stats.arcs_scanned += priced
+        if entering == -1:
+            break  # Optimal basis
+        next_arc = e
+        if stats is not None:
+            stats.pivots += 1
+
+        # Flow goes join -> ... -> first -> (entering) -> second -> ... -> join
+        if state[entering] == STATE_LOWER:
+            first, second = tails[entering], heads[entering]
+            delta = capacities[entering] - flow[entering]
+        else:
+            first, second = heads[entering], tails[entering]
+            delta = flow[entering]
+
+        u, v = first, second
+        while u != v:
+            if depth[u] >= depth[v]:
+                u = parent[u]
+            else:
+                v = parent[v]
+        join = u
+
+        # Ratio test; ties go to the last blocking arc on the second side (strongly feasible basis)
+        result = 0
+        u_out = -1
+        u = first
+        while u != join:
+            a = pred[u]
+            room = flow[a] if tails[a] == u else capacities[a] - flow[a]
+            if room < delta:
+                delta = room
+                u_out = u
+                result = 1
+            u = parent[u]
+        u = second
+        while u != join:
+            a = pred[u]
+            room = capacities[a] - flow[a] if tails[a] == u else flow[a]
+            if room <= delta:
+                delta = room
+                u_out = u
+                result = 2
+            u = parent[u]
+
+        # Augment around the cycle
+        if delta > 0:
+            flow[entering] += state[entering] * delta
+            u = first
+            while u != join:
+                a = pred[u]
+                flow[a] += -delta if tails[a] == u else delta
+                u = parent[u]
+            u = second
+            while u != join:
+                a = pred[u]
+                flow[a] += delta if tails[a] == u else -delta
+                u = parent[u]
+
+        if result == 0:
+            state[entering] = -state[entering]  # The entering arc went from one bound to the other
+            continue
+
+        leaving = pred[u_out]
+        state[leaving] = STATE_LOWER if flow[leaving] == 0 else STATE_UPPER
+        state[entering] = STATE_TREE
+        u_in, v_in = (first, second) if result == 1 else (second, first)
+
+        # Cut the subtree of u_out out of the thread
+        nodes = [u_out]
+        x = thread[u_out]
+        while depth[x] > depth[u_out]:
+            nodes.append(x)
+            x = thread[x]
+        before = rev_thread[u_out]
+        thread[before] = x
+        rev_thread[x] = before
+
+        # Re-root the subtree at u_in and hang it below v_in through the entering arc
+        x, new_parent, new_pred = u_in, v_in, entering
+        while True:
+            old_parent, old_pred = parent[x], pred[x]
+            parent[x], pred[x] = new_parent, new_pred
+            if x == u_out:
+                break
+            x, new_parent, new_pred = old_parent, x, old_pred
+
+        # New depths, potentials and preorder for the subtree, spliced in after v_in
+        children = {x: [] for x in nodes}
+        for x in nodes:
+            if x != u_in:
+                children[parent[x]].append(x)
+        previous = v_in
+        after = thread[v_in]
+        stack = [u_in]
+        while stack:
+            x = stack.pop()
+            p, a = parent[x], pred[x]
+            depth[x] = depth[p] + 1
+            potential[x] = potential[p] + costs[a] if tails[a] == p else potential[p] - costs[a]
+            thread[previous] = x
+            rev_thread[x] = previous
+            previous = x
+            stack.extend(children[x])
+        thread[previous] = after
+        rev_thread[after] = previous
+
+    # Any flow left on an artificial arc means the demand cannot be met
+    tolerance = 0 if isinstance(demand, int) else 1e-9 * max(1, demand)
+    if any(flow[a] > tolerance for a in range(m, arc_count)):
+        return None, -1, None, None, None  # Failure: Not enough flow to satisfy demand
+
+    arc_flows = [(tails[a], heads[a], flow[a]) for a in range(m) if flow[a] > 0]
+    total_cost = sum(flow[a] * costs[a] for a in range(m))
+
+    # Calculate metrics
+    label = list(ids).__getitem__
+    path_lengths = PathLengthStats() if path_stats is None else path_stats
+    if demand > 0:
+        for _, path in decompose_flow(arc_flows, s, t):
+            path_lengths.add(len(path) - 1, [label(u) for u in path] if path_lengths.keep_paths else None)
+    mean_length, mean_proportional_length = path_length_metrics(path_lengths, graph, source, mpl_mode)
+
+    return demand, total_cost, path_lengths.count, mean_length, mean_proportional_length
@@ -0,0 +1,138 @@
+"""
+Path-length metrics shared by the solvers.
+
+ML is the mean number of arcs on the augmenting (or decomposed) paths, and MPL is
+ML divided by a per-graph denominator. PathLengthStats accumulates the lengths as
+they are found in constant memory, so no solver keeps its paths or their lengths
+unless asked to (keep_paths=True). The denominator is one of:
+
+    "nodes"         |V| - 1, the length of a Hamiltonian path (the default)
+    "eccentricity"  the largest BFS distance from the source, in arcs
+    "condensation"  the longest path from the source in the SCC condensation, each
+                    component counted with all its nodes: an upper bound on the
+                    longest simple path from the source, exact on acyclic graphs
+
+The last two take one linear pass over the forward edges.
+"""
+from bisect import bisect_left
+from collections import deque
+
+MPL_MODES = ("nodes", "eccentricity", "condensation")
+
+
+class PathLengthStats:
+    """
+    Running count, sum, sum of squares, min and max of path lengths. Lengths are
+    integers, so the sums are exact and mean/variance carry no rounding drift.
+
+    bucket_bounds: optional upper bounds of a fixed-bucket histogram. histogram[i]
+        counts the lengths in (bounds[i - 1], bounds[i]], and the last bucket the
+        lengths above bounds[-1].
+    keep_paths: debug mode that also keeps every path (its nodes, source to sink) in paths.
+    """
+
+    def __init__(self, bucket_bounds=None, keep_paths=False):
+        self.count = 0
+        self.total = 0
+        self.total_squares = 0
+        self.min = None
+        self.max = None
+        self.bucket_bounds = tuple(sorted(bucket_bounds)) if bucket_bounds else None
+        self.histogram = [0] * (len(self.bucket_bounds) + 1) if self.bucket_bounds else None
+        self.paths = [] if keep_paths else None
+
+    @property
+    def keep_paths(self):
+        return self.paths is not None
+
+    def add(self, length, path=None):
+        """Records one path of length arcs; path (its nodes) is only kept in keep_paths mode."""
+        self.count += 1
+        self.total += length
+        self.total_squares += length * length
+        if self.min is None or length < self.min:
+            self.min = length
+        if self.max is None or length > self.max:
+            self.max = length
+        if self.histogram is not None:
+            self.histogram[bisect_left(self.bucket_bounds, length)] += 1
+        if self.paths is not None:
+            self.paths.append(path)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0
+
+    @property
+    def variance(self):
+        """Population variance of the lengths."""
+        if not self.count:
+            return 0
+        return (self.count * self.total_squares - self.total * self.total) / (self.count * self.count)
+
+    def as_dict(self):
+        data = {"count": self.count, "mean": self.mean, "variance": self.variance, "min": self.min, "max": self.max}
+        if self.histogram is not None:
+            data["bucket_bounds"] = list(self.bucket_bounds)
+            data["histogram"] = list(self.histogram)
+        return data
+
+
+# ----------------- Denominators ----------------- #
+def _eccentricity(graph, source):
+    distance = {source: 0}
+    queue = deque([source])
+    farthest = 0
+    while queue:
+        u = queue.popleft()
+        if u not in graph.adjacency_list:
+            continue  # No out-edges; looking it up would add it to a defaultdict adjacency list
+        for edge in graph.out_edges(u):
+            v = edge.to_node
+            if v not in distance:
+                distance[v] = distance[u] + 1
+                farthest = distance[v]
+                queue.append(v)
+    return farthest
+
+
+def _condensation_longest_path(graph, source):
+    from connectivity import strongly_connected_components
+
+    # Components come sinks first (reverse topological order), so successors are finished first
+    components = strongly_connected_components(graph)
+    component_of = {node: c for c, component in enumerate(components) for node in component}
+    if source not in component_of:
+        return 0
+    longest = [0] * len(components)  # Nodes on the longest component path starting at c
+    for c, component in enumerate(components):
+        best = 0
+        for node in component:
+            for edge in graph.out_edges(node):
+                d = component_of[edge.to_node]
+                if d != c and longest[d] > best:
+                    best = longest[d]
+        longest[c] = len(component) + best
+    return longest[component_of[source]] - 1
+
+
+def mpl_denominator(graph, source, mode="nodes"):
+    """Length, in arcs, that MPL divides the mean path length by; see the module docstring."""
+    if mode == "nodes":
+        return len(graph.adjacency_list.keys()) - 1
+    if mode == "eccentricity":
+        return _eccentricity(graph, source)
+    if mode == "condensation":
+        return _condensation_longest_path(graph, source)
+    raise ValueError(f"Unknown MPL mode '{mode}', expected one of {', '.join(MPL_MODES)}")
+
+
+def path_length_metrics(lengths, graph, source, mode="nodes"):
+    """
+    (ML, MPL) of a PathLengthStats. The denominator is only computed when there are paths,
+    and MPL is 0 when it is not positive.
+    """
+    if not lengths.count:
+        return 0, 0
+    denominator = mpl_denominator(graph, source, mode)
+    return lengths.mean, lengths.mean / denominator if denominator > 0 else 0
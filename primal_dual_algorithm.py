@@ -1,103 +1,276 @@
 from heapq import heappop, heappush
 
-def primal_dual_algorithm(graph, source, sink, total_demand):
+from path_metrics import PathLengthStats, path_length_metrics
+
+INF = float('inf')
+
+
+def _build_arc_arrays(graph):
+    """
+    Numbers the nodes 0..n-1 and copies the adjacency lists into flat arrays.
+    Node ids follow the label order when labels are sortable, so heap ties break as they
+    would on the labels. Arcs of node i are first[i]..first[i + 1] - 1, in adjacency order;
+    rev[a] is the arc paired with a, or -1 when the graph does not list it (not residual).
+    Returns (labels, ids, first, tail, head, capacity, cost, rev).
+    """
+    labels = list(graph.adjacency_list.keys())
+    try:
+        labels.sort()
+    except TypeError:
+        pass
+    ids = {label: i for i, label in enumerate(labels)}
+
+    first = [0]
+    tail, head, capacity, cost = [], [], [], []
+    arc_index = {}
+    edges = []
+    for i, label in enumerate(list(labels)):
+        for edge in graph.adjacency_list[label]:
+            v = edge.to_node
+            if v not in ids:
+                ids[v] = len(labels)
+                labels.append(v)
+            arc_index[edge] = len(edges)
+            edges.append(edge)
+            tail.append(i)
+            head.append(ids[v])
+            capacity.append(edge.capacity)
+            cost.append(edge.cost)
+        first.append(len(edges))
+    first.extend([len(edges)] * (len(labels) + 1 - len(first)))  # Nodes that only appear as heads
+
+    rev = [arc_index.get(edge.reverse_edge, -1) for edge in edges]
+    return labels, ids, first, tail, head, capacity, cost, rev
+
+
+def _admissible_levels(s, t, first, head, capacity, cost, potential, level):
+    """
+    BFS levels over the admissible arcs (capacity left, zero reduced cost).
+    Returns the labelled nodes, so the caller can reset level afterwards.
+    """
+    level[s] = 0
+    labelled = [s]
+    for u in labelled:
+        if u == t:
+            break
+        pu = potential[u]
+        for a in range(first[u], first[u + 1]):
+            v = head[a]
+            if level[v] == -1 and capacity[a] > 0 and cost[a] + pu - potential[v] == 0:
+                level[v] = level[u] + 1
+                labelled.append(v)
+    return labelled
+
+
+def _blocking_flow(s, t, limit, first, tail, head, capacity, cost, rev, potential, level):
+    """
+    Dinic blocking flow on the level graph of admissible arcs, at most limit units.
+    Walks an explicit path with current-arc pointers, so dead ends are never rescanned.
+    Returns the augmentations as (flow, arcs) pairs.
+    """
+    current = {}
+    augmentations = []
+    path = []
+    u = s
+    while limit > 0:
+        if u == t:
+            path_flow = min(limit, min(capacity[a] for a in path))
+            for a in path:
+                capacity[a] -= path_flow
+                if rev[a] != -1:
+                    capacity[rev[a]] += path_flow
+            augmentations.append((path_flow, list(path)))
+            limit -= path_flow
+
+            # Retreat to the tail of the first saturated arc
+            if limit > 0:
+                del path[next(k for k, a in enumerate(path) if capacity[a] <= 0):]
+                u = head[path[-1]] if path else s
+            continue
+
+        a = current.get(u, first[u])
+        pu = potential[u]
+        end = first[u + 1]
+        while a < end:
+            v = head[a]
+            if capacity[a] > 0 and level[v] == level[u] + 1 and cost[a] + pu - potential[v] == 0:
+                break
+            a += 1
+        current[u] = a
+
+        if a < end:
+            path.append(a)
+            u = head[a]
+        elif u == s:
+            break
+        else:
+            level[u] = -1  # Dead end: drop it from the level graph
+            a = path.pop()
+            current[tail[a]] = a + 1
+            u = tail[a]
+
+    return augmentations
+
+
+def primal_dual_algorithm(graph, source, sink, total_demand, method="path", stats=None, mpl_mode="nodes",
+                          path_stats=None):
+    """
+    method="path" pushes one shortest augmenting path per Dijkstra.
+    method="blocking" runs a Dinic blocking flow on the admissible (zero reduced cost)
+    arcs after each Dijkstra, sending every currently shortest path in one phase.
+    stats: optional instrumentation.SolverStats; in blocking mode each level graph is a phase.
+    mpl_mode: MPL denominator, see path_metrics.
+    path_stats: path_metrics.PathLengthStats to accumulate the path lengths into, e.g. one with a
+        histogram or keep_paths=True; by default a plain one is used.
+    """
     print("==== PRIMAL-DUAL MINIMUM COST FLOW ====")
 
     total_flow = 0
     total_cost = 0
     augmenting_paths = 0
-    path_lengths = []
+    path_lengths = PathLengthStats() if path_stats is None else path_stats
 
-    graph_copy = {node: [{'to': e.to_node, 'capacity': e.capacity, 'cost': e.cost, 'reverse_flow': 0}
-                         for e in graph.adjacency_list[node]]
-                  for node in graph.adjacency_list}
+    # Work on array copies of the arcs; the graph itself is left untouched
+    labels, ids, first, tail, head, capacity, cost, rev = _build_arc_arrays(graph)
+    n = len(labels)
+    s, t = ids[source], ids[sink]
 
-    # Compute initial dual variables (potential)
-    potential = {node: float('inf') for node in graph.adjacency_list}
-    potential[source] = 0
-
-    # Compute reduced costs and update potentials
+    # Compute initial dual variables (potential) with Bellman-Ford
+    potential = [INF] * n
+    potential[s] = 0
     for _ in range(len(graph.adjacency_list) - 1):
-        for u in graph.adjacency_list:
-            for edge in graph.adjacency_list[u]:
-                v = edge.to_node
-                if potential[u] + edge.cost < potential[v] and edge.capacity > 0:
-                    potential[v] = potential[u] + edge.cost
+        changed = False
+        for u in range(n):
+            pu = potential[u]
+            if pu == INF:
+                continue
+            if stats is not None:
+                stats.nodes_scanned += 1
+                stats.arcs_scanned += first[u + 1] - first[u]
+            for a in range(first[u], first[u + 1]):
+                v = head[a]
+                if pu + cost[a] < potential[v] and capacity[a] > 0:
+                    potential[v] = pu + cost[a]
+                    changed = True
+                    if stats is not None:
+                        stats.relaxations += 1
+        if not changed:
+            break
+
+    # Per-iteration state; only the nodes in touched are reset afterwards
+    dist = [INF] * n
+    parent = [-1] * n
+    level = [-1] * n
 
     while total_demand > 0:
-        # Find shortest path with reduced costs using Dijkstra
-        dist = {node: float('inf') for node in graph.adjacency_list}
-        parent = {node: None for node in graph.adjacency_list}
-        dist[source] = 0
-        pq = [(0, source)]
+        # Find shortest path with reduced costs using Dijkstra (stale heap entries are skipped)
+        dist[s] = 0
+        touched = [s]
+        pq = [(0, s)]
+        if stats is not None:
+            stats.searches += 1
+            stats.heap_pushes += 1
 
         while pq:
-            curr_dist, u = heappop(pq)
+            d, u = heappop(pq)
+            if stats is not None:
+                stats.heap_pops += 1
 
-            if u == sink:
+            if u == t:
                 break
 
-            if curr_dist > dist[u]:
+            if d > dist[u]:
                 continue
 
-            for edge_idx, edge in enumerate(graph_copy[u]):
-                v = edge['to']
-                # Compute reduced cost
-                reduced_cost = edge['cost'] + potential[u] - potential[v]
-
-                if edge['capacity'] > 0 and dist[u] + reduced_cost < dist[v]:
-                    dist[v] = dist[u] + reduced_cost
-                    parent[v] = (u, edge_idx)
-                    heappush(pq, (dist[v], v))
+            if stats is not None:
+                stats.nodes_scanned += 1
+                stats.arcs_scanned += first[u + 1] - first[u]
+            pu = potential[u]
+            for a in range(first[u], first[u + 1]):
+                if capacity[a] > 0:
+                    v = head[a]
+                    # Compute reduced cost
+                    new_dist = d + (cost[a] + pu - potential[v])
+                    if new_dist < dist[v]:
+                        if dist[v] == INF:
+                            touched.append(v)
+                        dist[v] = new_dist
+                        parent[v] = a
+                        heappush(pq, (new_dist, v))
+                        if stats is not None:
+                            stats.relaxations += 1
+                            stats.heap_pushes += 1
 
         # Check if path to sink exists
-        if parent[sink] is None:
+        if parent[t] == -1:
             break
 
-        # Find bottleneck flow along the path
-        path_flow = total_demand
-        v = sink
+        # Find the path before the labels are reset
         path = []
-        while v != source:
-            u, edge_idx = parent[v]
-            path_flow = min(path_flow, graph_copy[u][edge_idx]['capacity'])
-            path.append(graph_copy[u][edge_idx])
-            v = u
+        v = t
+        while v != s:
+            a = parent[v]
+            path.append(a)
+            v = tail[a]
         path.reverse()
 
-        # Augment flow along the path
-        v = sink
-        while v != source:
-            u, edge_idx = parent[v]
-            graph_copy[u][edge_idx]['capacity'] -= path_flow
-            graph_copy[u][edge_idx]['reverse_flow'] += path_flow
-
-            # Find and update reverse edge
-            for rev_edge in graph_copy[v]:
-                if rev_edge['to'] == u:
-                    rev_edge['capacity'] += path_flow
+        # Dijkstra stopped at the sink, so only the nodes closer than it are settled. They move
+        # by dist - dist[sink] and every other node stays put: every shortest path to the sink
+        # gets zero reduced cost and no reduced cost turns negative
+        sink_dist = dist[t]
+        for v in touched:
+            if dist[v] < sink_dist:
+                potential[v] += dist[v] - sink_dist
+            dist[v] = INF
+            parent[v] = -1
+
+        if method == "blocking":
+            # Saturate the admissible network, one level graph at a time
+            while total_demand > 0:
+                labelled = _admissible_levels(s, t, first, head, capacity, cost, potential, level)
+                reached = level[t] != -1
+                if reached:
+                    if stats is not None:
+                        stats.phases += 1
+                    for path_flow, path in _blocking_flow(s, t, total_demand, first, tail, head,
+                                                          capacity, cost, rev, potential, level):
+                        total_flow += path_flow
+                        total_cost += path_flow * sum(cost[a] for a in path)
+                        total_demand -= path_flow
+                        augmenting_paths += 1
+                        nodes = [source] + [labels[head[a]] for a in path] if path_lengths.keep_paths else None
+                        path_lengths.add(len(path), nodes)
+                        if stats is not None:
+                            stats.augmentations += 1
+                for v in labelled:
+                    level[v] = -1
+                if not reached:
                     break
+            continue
 
-            v = u
+        # Find bottleneck flow along the path
+        path_flow = min(total_demand, min(capacity[a] for a in path))
+
+        # Augment flow along the path and its paired reverse arcs
+        for a in path:
+            capacity[a] -= path_flow
+            if rev[a] != -1:
+                capacity[rev[a]] += path_flow
 
         # Update flow and cost metrics
         total_flow += path_flow
-        total_cost += path_flow * sum(edge['cost'] for edge in path)
+        total_cost += path_flow * sum(cost[a] for a in path)
         total_demand -= path_flow
         augmenting_paths += 1
-        path_lengths.append(len(path))
-
-        # Update potentials
-        for node in graph.adjacency_list:
-            if dist[node] != float('inf'):
-                potential[node] += dist[node]
+        nodes = [source] + [labels[head[a]] for a in path] if path_lengths.keep_paths else None
+        path_lengths.add(len(path), nodes)
+        if stats is not None:
+            stats.augmentations += 1
 
     # Compute path length metrics
-    longest_path = len(graph.adjacency_list.keys()) - 1
-    mean_length = sum(path_lengths) / len(path_lengths) if path_lengths else 0
-    mean_proportional_length = sum(pl / longest_path for pl in path_lengths) / len(path_lengths) if path_lengths else 0
+    mean_length, mean_proportional_length = path_length_metrics(path_lengths, graph, source, mpl_mode)
 
     if total_demand > 0:
         return None, -1, augmenting_paths, mean_length, mean_proportional_length
 
-    return total_flow, total_cost, augmenting_paths, mean_length, mean_proportional_length
\ No newline at end of file
+    return total_flow, total_cost, augmenting_paths, mean_length, mean_proportional_length
@@ -0,0 +1,181 @@
+"""
+Buffered result sinks.
+
+A ResultWriter collects result rows (dicts with typed fields) in memory and writes
+them in one go on flush(), instead of reopening the result file for every row.
+The sink follows the file extension:
+
+    .csv                     comma-separated, one header line, then the rows
+    .db, .sqlite, .sqlite3   one SQLite table, inserted with executemany
+    anything else            text, one line per row from the writer's formatter
+
+Rows describe their graph with typed fields (graph_id, n, r, upper_cap, upper_cost)
+parsed once from the generated filename, so nothing has to re-parse the output.
+"""
+import csv
+import os
+import re
+import sqlite3
+import threading
+
+# SQLite column types of the known fields; other fields are left untyped
+FIELD_TYPES = {
+    "graph": "TEXT", "algorithm": "TEXT",
+    "graph_id": "INTEGER", "n": "INTEGER", "upper_cap": "INTEGER", "upper_cost": "INTEGER",
+    "r": "REAL", "fmax": "REAL", "flow": "REAL", "cost": "REAL", "paths": "INTEGER",
+    "ml": "REAL", "mpl": "REAL", "arcs": "TEXT", "vlcc": "INTEGER", "delta_out": "INTEGER", "delta_in": "INTEGER", "k": "REAL",
+}
+
+_SQLITE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+_GRAPH_FILENAME = re.compile(r"graph_(\d+)_n(\d+)_r([0-9.]+?)_cap(\d+)_cost(\d+)(?:\.\w+)?$")
+
+
+def parse_graph_filename(filename):
+    """
+    Instance parameters of a generated graph file "graph_<id>_n<n>_r<r>_cap<cap>_cost<cost>.txt",
+    as a dict of typed fields. The fields are None when the name does not follow that pattern.
+    """
+    match = _GRAPH_FILENAME.search(os.path.basename(filename))
+    if match is None:
+        return {"graph_id": None, "n": None, "r": None, "upper_cap": None, "upper_cost": None}
+    graph_id, n, r, upper_cap, upper_cost = match.groups()
+    return {"graph_id": int(graph_id), "n": int(n), "r": float(r),
+            "upper_cap": int(upper_cap), "upper_cost": int(upper_cost)}
+
+
+def ford_fulkerson_row(max_flow, metrics, filename):
+    """Row of graph, graph_id, n, r, upper_cap, upper_cost, fmax, vlcc, delta_out, delta_in, k."""
+    row = {"graph": os.path.basename(filename), **parse_graph_filename(filename)}
+    row.update(fmax=max_flow, vlcc=metrics['|VLCC|'], delta_out=metrics['∆out(LCC)'],
+               delta_in=metrics['∆in(LCC)'], k=metrics['k(LCC)'])
+    return row
+
+
+def algorithm_row(algo, filename, flow, cost, num_paths, mean_length, mean_proportional_length, arcs=None):
+    """
+    Row of algorithm, graph, graph_id, n, r, upper_cap, upper_cost, flow, cost, paths, ml, mpl,
+    and arcs when given: "forward" or "residual", the arcs the algorithm could send flow on.
+    """
+    row = {"algorithm": algo, "graph": os.path.basename(filename), **parse_graph_filename(filename)}
+    row.update(flow=flow, cost=cost, paths=num_paths, ml=mean_length, mpl=mean_proportional_length)
+    if arcs is not None:
+        row["arcs"] = arcs
+    return row
+
+
+# ----------------- Text Formats ----------------- #
+def _text(value, fallback):
+    return fallback if value is None else value
+
+
+def format_ford_fulkerson_row(row):
+    """The fixed-width line of the *_ford_fulkerson_results.txt files."""
+    return "{:<10}\t{:<5}\t{:<5}\t{:<10}\t{:<10}\t{:<10}\t{:<10}\t{:<12}\t{:<12}\t{:<10.4f}".format(
+        _text(row["graph_id"], row["graph"]), _text(row["n"], "N/A"), _text(row["r"], "N/A"),
+        _text(row["upper_cap"], "N/A"), _text(row["upper_cost"], "N/A"),
+        row["fmax"], row["vlcc"], row["delta_out"], row["delta_in"], row["k"])
+
+
+def format_algorithm_row(row):
+    """The fixed-width line of the *_algorithms_results.txt files."""
+    line = "{:<15}\t{:<15}\t{:<8.4f}\t{:<12.4f}\t{:<10}\t{:<10.4f}\t{:<10.4f}".format(
+        row["algorithm"],
+        _text(row["graph_id"], row["graph"]),
+        row["flow"] or 0,  # Flow (with fallback to 0 if None)
+        row["cost"] or 0,
+        row["paths"] or 'N/A',
+        row["ml"] or 0,
+        row["mpl"] or 0)
+    if row.get("arcs") is not None:
+        line += "\t{:<10}".format(row["arcs"])
+    return line
+
+
+# ----------------- Writer ----------------- #
+class ResultWriter:
+    """
+    Buffers rows in memory and writes them to file_path on flush() (and when used as a
+    context manager, on exit). add() and flush() take a lock, so threads can share one
+    writer; process pools should hand their rows back to the parent that owns it.
+
+    formatter: row -> line, required for text files.
+    table: SQLite table name.
+    """
+
+    def __init__(self, file_path, formatter=None, table="results"):
+        extension = os.path.splitext(file_path)[1].lower()
+        if extension == ".csv":
+            self.kind = "csv"
+        elif extension in _SQLITE_EXTENSIONS:
+            self.kind = "sqlite"
+        else:
+            if formatter is None:
+                raise ValueError(f"A text result file needs a row formatter: {file_path}")
+            self.kind = "text"
+        if not re.fullmatch(r"[A-Za-z_]\w*", table):
+            raise ValueError(f"Invalid table name '{table}'")
+
+        self.file_path = file_path
+        self.formatter = formatter
+        self.table = table
+        self.rows = []
+        self._lock = threading.Lock()
+
+    def add(self, row):
+        with self._lock:
+            self.rows.append(row)
+
+    def add_line(self, line):
+        """Adds a literal line, such as a separator, to a text file."""
+        if self.kind != "text":
+            raise ValueError(f"Literal lines only go to text result files, not {self.file_path}")
+        self.add(line)
+
+    def flush(self):
+        """Writes and forgets the buffered rows, appending to what the file already holds."""
+        with self._lock:
+            rows, self.rows = self.rows, []
+            if not rows:
+                return
+            folder_path = os.path.dirname(self.file_path)
+            if folder_path:
+                os.makedirs(folder_path, exist_ok=True)
+            if self.kind == "csv":
+                self._write_csv(rows)
+            elif self.kind == "sqlite":
+                self._write_sqlite(rows)
+            else:
+                self._write_text(rows)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.flush()
+
+    def _write_text(self, rows):
+        with open(self.file_path, 'a', encoding='utf-8') as f:
+            f.write("".join((row if isinstance(row, str) else self.formatter(row)) + "\n" for row in rows))
+
+    def _write_csv(self, rows):
+        fields = list(rows[0])
+        new_file = not os.path.exists(self.file_path) or os.path.getsize(self.file_path) == 0
+        with open(self.file_path, 'a', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            if new_file:
+                writer.writeheader()
+            writer.writerows(rows)
+
+    def _write_sqlite(self, rows):
+        fields = list(rows[0])
+        columns = ", ".join(f'"{field}" {FIELD_TYPES.get(field, "")}'.rstrip() for field in fields)
+        names = ", ".join(f'"{field}"' for field in fields)
+        placeholders = ", ".join("?" * len(fields))
+        connection = sqlite3.connect(self.file_path)
+        try:
+            with connection:
+                connection.execute(f'CREATE TABLE IF NOT EXISTS "{self.table}" ({columns})')
+                connection.executemany(f'INSERT INTO "{self.table}" ({names}) VALUES ({placeholders})',
+                                       [tuple(row[field] for field in fields) for row in rows])
+        finally:
+            connection.close()
@@ -1,10 +1,17 @@
 import os
 import random
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only the vectorised generator needs it
+    np = None
 
 
 class DirectedGraph:
     def __init__(self):
         self.graph = {}  # Adjacency list representation
+        self.edge_set = set()  # (u, v) pairs, for O(1) has_edge
 
     def add_node(self, node):
         if node not in self.graph:
@@ -14,9 +21,10 @@ class DirectedGraph:
         if u not in self.graph:
             self.graph[u] = []
         self.graph[u].append({'to': v, 'capacity': capacity, 'cost': cost})
+        self.edge_set.add((u, v))
 
     def has_edge(self, u, v):
-        return any(edge['to'] == v for edge in self.graph.get(u, []))
+        return (u, v) in self.edge_set
 
     def number_of_nodes(self):
         return len(self.graph)
@@ -25,33 +33,177 @@ class DirectedGraph:
         return sum(len(neighbors) for neighbors in self.graph.values())
 
 
-def generate_sink_source_graph(n, r, upper_cap, upper_cost):
+def generate_sink_source_graph(n, r, upper_cap, upper_cost, seed=None, spatial_index=True):
+    """
+    Random geometric source-sink graph: n points in the unit square, and each ordered
+    pair within distance r gets a 0.3/0.3 chance of an edge one way or the other.
+
+    Parameters:
+        seed (int): Seeds a private RNG; None draws from the global `random` module
+        spatial_index (bool): Bucket points into r x r grid cells and only compare
+            neighbouring cells instead of all n^2 pairs. The edge distribution is the same.
+    """
+    rng = random if seed is None else random.Random(seed)
     G = DirectedGraph()
 
     # Assign random coordinates to nodes
-    coordinates = [(random.uniform(0, 1), random.uniform(0, 1)) for _ in range(n)]
+    coordinates = [(rng.uniform(0, 1), rng.uniform(0, 1)) for _ in range(n)]
     for i in range(n):
         G.add_node(i)
 
+    def visit(u, v):
+        rand = rng.uniform(0, 1)
+        if rand < 0.3 and not G.has_edge(u, v) and not G.has_edge(v, u):
+            cap = rng.randint(1, upper_cap)
+            cost = rng.randint(1, upper_cost)
+            G.add_edge(u, v, capacity=cap, cost=cost)
+        elif rand < 0.6 and not G.has_edge(u, v) and not G.has_edge(v, u):
+            cap = rng.randint(1, upper_cap)
+            cost = rng.randint(1, upper_cost)
+            G.add_edge(v, u, capacity=cap, cost=cost)
+
     # Add edges based on Euclidean distance
-    for u in range(n):
-        for v in range(n):
-            if u != v:
-                dist = (coordinates[u][0] - coordinates[v][0]) ** 2 + (coordinates[u][1] - coordinates[v][1]) ** 2
-                if dist <= r ** 2:
-                    rand = random.uniform(0, 1)
-                    if rand < 0.3 and not G.has_edge(u, v) and not G.has_edge(v, u):
-                        cap = random.randint(1, upper_cap)
-                        cost = random.randint(1, upper_cost)
-                        G.add_edge(u, v, capacity=cap, cost=cost)
-                    elif rand < 0.6 and not G.has_edge(u, v) and not G.has_edge(v, u):
-                        cap = random.randint(1, upper_cap)
-                        cost = random.randint(1, upper_cost)
-                        G.add_edge(v, u, capacity=cap, cost=cost)
+    if not spatial_index:
+        for u in range(n):
+            for v in range(n):
+                if u != v:
+                    dist = (coordinates[u][0] - coordinates[v][0]) ** 2 + (coordinates[u][1] - coordinates[v][1]) ** 2
+                    if dist <= r ** 2:
+                        visit(u, v)
+        return G
+
+    if r <= 0:
+        return G
+    for u, v in _pairs_within_radius(coordinates, r):
+        # Both orientations of the pair get their draw, as in the all-pairs loop
+        visit(u, v)
+        visit(v, u)
 
     return G
 
 
+def _pairs_within_radius(coordinates, r):
+    """
+    Yields every pair (u, v), u < v, of points at most r apart, using a uniform grid
+    of r x r cells so each point is only compared with points in the 3 x 3 cells around it.
+    """
+    cells = {}
+    for i, (x, y) in enumerate(coordinates):
+        cells.setdefault((int(x // r), int(y // r)), []).append(i)
+
+    r_squared = r ** 2
+    for (cx, cy), members in cells.items():
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                neighbours = cells.get((cx + dx, cy + dy))
+                if neighbours is None:
+                    continue
+                for u in members:
+                    ux, uy = coordinates[u]
+                    for v in neighbours:
+                        if v > u and (ux - coordinates[v][0]) ** 2 + (uy - coordinates[v][1]) ** 2 <= r_squared:
+                            yield u, v
+
+
+def generate_sink_source_edge_arrays(n, r, upper_cap, upper_cost, seed=None, block_size=1 << 22):
+    """
+    Vectorised (NumPy) version of generate_sink_source_graph. Draws the same
+    distribution of graphs in bulk and returns the edges as four int64 arrays
+    (tails, heads, capacities, costs), grouped by tail node.
+
+    Parameters:
+        seed (int): Seed for numpy.random.default_rng
+        block_size (int): Upper bound on the number of point pairs whose distances
+            are held in memory at once
+    """
+    if np is None:
+        raise ImportError("generate_sink_source_edge_arrays requires NumPy")
+
+    rng = np.random.default_rng(seed)
+    coordinates = rng.random((n, 2))
+
+    # Sweep over points sorted by x: partners of a block lie within x + r of its last point
+    order = np.argsort(coordinates[:, 0], kind='stable')
+    xs = coordinates[order, 0]
+    ys = coordinates[order, 1]
+    r_squared = r * r
+    pair_u, pair_v = [], []
+    start = 0
+    while start < n and r > 0:
+        # Rows: the points in the next x-strip of width r (fewer if the block would be too big)
+        strip = int(np.searchsorted(xs, xs[start] + r, side='right')) - start
+        rows = max(1, min(strip, block_size // max(1, 2 * strip)))
+        end = start + rows
+        band_end = int(np.searchsorted(xs, xs[end - 1] + r, side='right'))
+
+        dx = xs[start:end, None] - xs[None, start:band_end]
+        dy = ys[start:end, None] - ys[None, start:band_end]
+        within = dx * dx + dy * dy <= r_squared
+        i, j = np.nonzero(within)
+        i += start
+        j += start
+        keep = j > i
+        pair_u.append(order[i[keep]])
+        pair_v.append(order[j[keep]])
+        start = end
+
+    if pair_u:
+        u = np.concatenate(pair_u)
+        v = np.concatenate(pair_v)
+    else:
+        u = v = np.empty(0, dtype=np.int64)
+    a = np.minimum(u, v)
+    b = np.maximum(u, v)
+
+    # Two visits per pair, (a, b) then (b, a), each with a 0.3/0.3 orientation draw
+    first = rng.random(len(a))
+    second = rng.random(len(a))
+    first_none = first >= 0.6
+    forward = (first < 0.3) | (first_none & (second >= 0.3) & (second < 0.6))
+    backward = ((first >= 0.3) & (first < 0.6)) | (first_none & (second < 0.3))
+    chosen = forward | backward
+
+    tails = np.where(forward, a, b)[chosen]
+    heads = np.where(forward, b, a)[chosen]
+    capacities = rng.integers(1, upper_cap, size=len(tails), endpoint=True)
+    costs = rng.integers(1, upper_cost, size=len(tails), endpoint=True)
+
+    grouped = np.lexsort((heads, tails))
+    return (tails[grouped].astype(np.int64), heads[grouped].astype(np.int64),
+            capacities[grouped].astype(np.int64), costs[grouped].astype(np.int64))
+
+
+def generate_sink_source_csr_graph(n, r, upper_cap, upper_cost, seed=None):
+    """
+    Vectorised generation straight into a CSRGraph, without a DirectedGraph in between.
+    """
+    from csr_graph import CSRGraph
+
+    columns = generate_sink_source_edge_arrays(n, r, upper_cap, upper_cost, seed)
+    return CSRGraph.from_arrays(*(_int64_array(column) for column in columns))
+
+
+def _int64_array(column):
+    """Copies a NumPy column into an array('q') in one bulk operation."""
+    result = array('q')
+    result.frombytes(np.ascontiguousarray(column, dtype=np.int64).tobytes())
+    return result
+
+
+def save_edge_arrays_to_file(tails, heads, capacities, costs, folder_path, filename):
+    """
+    Save edge columns to a file in the same edge list format as save_graph_to_file.
+    """
+    os.makedirs(folder_path, exist_ok=True)
+    file_path = os.path.join(folder_path, filename)
+    if np is not None:
+        np.savetxt(file_path, np.column_stack((tails, heads, capacities, costs)), fmt='%d')
+        return
+    with open(file_path, 'w') as f:
+        for u, v, capacity, cost in zip(tails, heads, capacities, costs):
+            f.write(f"{u} {v} {capacity} {cost}\n")
+
+
 def save_graph_to_file(graph, folder_path, filename):
     """
     Save the generated graph to a file in edge list format.
@@ -75,25 +227,33 @@ def save_graph_to_file(graph, folder_path, filename):
                 f.write(f"{u} {v} {capacity} {cost}\n")
 
 
-def generate_graphs_for_simulation(parameter_sets, simulation_name):
+def generate_graphs_for_simulation(parameter_sets, simulation_name, seed=None, backend="python"):
     """
     Generate graphs based on parameter sets and save them to files under a specific simulation folder.
 
     Parameters:
         parameter_sets (list of tuples): Each tuple contains (n, r, upper_cap, upper_cost)
         simulation_name (str): The name of the simulation (e.g., 'Simulation1')
+        seed (int): If given, graph i is generated with seed + i
+        backend (str): "python" (DirectedGraph) or "numpy" (vectorised edge arrays)
     """
     folder_path = os.path.join("./Graphs", simulation_name)
     for i, (n, r, upper_cap, upper_cost) in enumerate(parameter_sets, 1):
-        # Generate graph
-        G = generate_sink_source_graph(n, r, upper_cap, upper_cost)
+        graph_seed = None if seed is None else seed + i
 
         # Create filename
         filename = f"graph_{i}_n{n}_r{r}_cap{upper_cap}_cost{upper_cost}.txt"
 
-        # Save the graph
-        save_graph_to_file(G, folder_path, filename)
+        # Generate and save the graph
+        if backend == "numpy":
+            columns = generate_sink_source_edge_arrays(n, r, upper_cap, upper_cost, graph_seed)
+            save_edge_arrays_to_file(*columns, folder_path, filename)
+            num_edges = len(columns[0])
+        else:
+            G = generate_sink_source_graph(n, r, upper_cap, upper_cost, graph_seed)
+            save_graph_to_file(G, folder_path, filename)
+            num_edges = G.number_of_edges()
 
         # Print details
         print(f"Graph {i}: n={n}, r={r}, upperCap={upper_cap}, upperCost={upper_cost}")
-        print(f"Nodes: {G.number_of_nodes()}, Edges: {G.number_of_edges()}\n")
\ No newline at end of file
+        print(f"Nodes: {n}, Edges: {num_edges}\n")
\ No newline at end of file
@@ -1,34 +1,119 @@
+from heapq import heappop, heappush
+
+from path_metrics import PathLengthStats, path_length_metrics
+
+
 # Bellman-Ford Algorithm
-def bellman_ford(graph, source):
+def bellman_ford(graph, source, stats=None):
     dist = {node: float('inf') for node in graph.adjacency_list.keys()}
     parent = {node: None for node in graph.adjacency_list.keys()}
     dist[source] = 0
 
     for _ in range(len(graph.adjacency_list) - 1):
+        changed = False
         for u in graph.adjacency_list.keys():
+            if stats is not None:
+                stats.nodes_scanned += 1
+                stats.arcs_scanned += len(graph.adjacency_list[u])
             for edge in graph.adjacency_list[u]:
                 v = edge.to_node
                 if edge.capacity > 0 and dist[u] + edge.cost < dist[v]:
                     dist[v] = dist[u] + edge.cost
-                    parent[v] = u
+                    parent[v] = edge
+                    changed = True
+                    if stats is not None:
+                        stats.relaxations += 1
+        if not changed:
+            break  # Later rounds cannot change anything either
 
     return dist, parent
 
 
+# Dijkstra on reduced costs
+def dijkstra_with_potentials(graph, source, sink, potential, stats=None):
+    """
+    Shortest paths from source using reduced costs cost + potential[u] - potential[v],
+    which are non-negative on every arc with capacity left. Stops once sink is settled.
+    Returns the distances, the parent edge of each reached node and the settled nodes.
+    """
+    dist = {source: 0}
+    parent = {}
+    settled = []
+    done = set()
+    pq = [(0, source)]
+
+    while pq:
+        d, u = heappop(pq)
+        if stats is not None:
+            stats.heap_pops += 1
+        if u in done:
+            continue
+        done.add(u)
+        settled.append(u)
+        if u == sink:
+            break
+        if stats is not None:
+            stats.nodes_scanned += 1
+            stats.arcs_scanned += len(graph.adjacency_list[u])
+
+        for edge in graph.adjacency_list[u]:
+            if edge.capacity > 0:
+                v = edge.to_node
+                new_dist = d + edge.cost + potential[u] - potential.get(v, 0)
+                if v not in done and new_dist < dist.get(v, float('inf')):
+                    dist[v] = new_dist
+                    parent[v] = edge
+                    heappush(pq, (new_dist, v))
+                    if stats is not None:
+                        stats.relaxations += 1
+                        stats.heap_pushes += 1
+
+    return dist, parent, settled
+
+
 # Successive Shortest Path Algorithm
-def successive_shortest_paths(graph, source, sink, total_flow):
+def successive_shortest_paths(graph, source, sink, total_flow, method="bellman_ford", stats=None, mpl_mode="nodes",
+                              path_stats=None):
+    """
+    method="bellman_ford" recomputes shortest paths from scratch for every augmentation.
+    method="dijkstra" runs Bellman-Ford once for node potentials and then Dijkstra on
+    reduced costs, keeping the potentials up to date after each augmentation. The two
+    break ties between equal-cost paths differently: on a residual graph they reach the
+    same cost, but the paths (and so ML/MPL) can differ, and on forward-only graphs,
+    where SSP is greedy, the cost can differ too.
+    stats: optional instrumentation.SolverStats that counts the work done.
+    mpl_mode: MPL denominator, see path_metrics.
+    path_stats: path_metrics.PathLengthStats to accumulate the path lengths into, e.g. one with a
+        histogram or keep_paths=True; by default a plain one is used.
+    """
     print("==== SUCCESIVE SHORTEST PATHS ====")
     flow = 0
     total_cost = 0
     augmenting_paths = 0
-    path_lengths = []
+    path_lengths = PathLengthStats() if path_stats is None else path_stats
+    potential = None
 
     while total_flow > 0:
-        # Find shortest path using Bellman-Ford
-        dist, parent = bellman_ford(graph, source)
+        if stats is not None:
+            stats.searches += 1
+        if method == "dijkstra":
+            if potential is None:
+                dist, _ = bellman_ford(graph, source, stats)
+                potential = {node: d if d != float('inf') else 0 for node, d in dist.items()}
+
+            dist, parent, settled = dijkstra_with_potentials(graph, source, sink, potential, stats)
+            if sink not in dist:
+                break  # Sink is unreachable
 
-        if dist[sink] == float('inf'):
-            break  # Sink is unreachable
+            # Shift potentials so reduced costs stay non-negative for the next search
+            for node in settled:
+                potential[node] = potential.get(node, 0) + dist[node] - dist[sink]
+        else:
+            # Find shortest path using Bellman-Ford
+            dist, parent = bellman_ford(graph, source, stats)
+
+            if dist[sink] == float('inf'):
+                break  # Sink is unreachable
 
         # Find minimum flow along the path
         path_flow = float('inf')
@@ -36,39 +121,34 @@ def successive_shortest_paths(graph, source, sink, total_flow):
         v = sink
 
         while v != source:
-            u = parent[v]
-            for edge in graph.adjacency_list[u]:
-                if edge.to_node == v:
-                    path_flow = min(path_flow, edge.capacity)
-                    break
+            edge = parent[v]
+            path_flow = min(path_flow, edge.capacity)
             path_length += 1
-            v = u
+            v = edge.from_node
 
         path_flow = min(path_flow, total_flow)
 
         # Update residual capacities
+        nodes = [sink] if path_lengths.keep_paths else None
         v = sink
         while v != source:
-            u = parent[v]
-            for edge in graph.adjacency_list[u]:
-                if edge.to_node == v:
-                    edge.capacity -= path_flow
-                    total_cost += path_flow * edge.cost
-            for edge in graph.adjacency_list[v]:
-                if edge.to_node == u:
-                    edge.capacity += path_flow
-                    break
-            v = u
+            edge = parent[v]
+            edge.capacity -= path_flow
+            edge.reverse_edge.capacity += path_flow
+            total_cost += path_flow * edge.cost
+            v = edge.from_node
+            if nodes is not None:
+                nodes.append(v)
 
         flow += path_flow
         total_flow -= path_flow
         augmenting_paths += 1
-        path_lengths.append(path_length)
+        path_lengths.add(path_length, nodes[::-1] if nodes is not None else None)
+        if stats is not None:
+            stats.augmentations += 1
 
     # Calculate metrics
-    longest_path = len(graph.adjacency_list.keys()) - 1
-    mean_length = sum(path_lengths) / len(path_lengths) if path_lengths else 0
-    mean_proportional_length = sum(pl / longest_path for pl in path_lengths) / len(path_lengths) if path_lengths else 0
+    mean_length, mean_proportional_length = path_length_metrics(path_lengths, graph, source, mpl_mode)
 
     if total_flow > 0:
         return None, -1, augmenting_paths, mean_length, mean_proportional_length
@@ -1,19 +1,34 @@
 import math
+from path_metrics import PathLengthStats, path_length_metrics
+from utility import cancel_negative_cycles
 
 
-def successive_shortest_paths_capacity_scaling(graph, source, sink, demand):
+def successive_shortest_paths_capacity_scaling(graph, source, sink, demand, stats=None, mpl_mode="nodes",
+                                               path_stats=None):
+    """
+    stats: optional instrumentation.SolverStats that counts the work done.
+    mpl_mode: MPL denominator, see path_metrics.
+    path_stats: path_metrics.PathLengthStats to accumulate the path lengths into, e.g. one with a
+        histogram or keep_paths=True; by default a plain one is used.
+    """
     print("==== SUCCESSIVE SHORTEST PATHS WITH CAPACITY SCALING ====")
+    # Residual capacity below this is a rounding leftover of a fractional demand
+    min_residual = 1 if isinstance(demand, int) else 1e-9 * max(1, demand)
     total_flow = 0
     total_cost = 0
     augmenting_paths = 0
-    path_lengths = []
+    path_lengths = PathLengthStats() if path_stats is None else path_stats
 
     # Find maximum capacity for scaling
     max_capacity = max(edge.capacity for edge in graph.edges)
     scaling_factor = 2 ** (math.floor(math.log2(max_capacity)))
 
     while scaling_factor >= 1:
+        if stats is not None:
+            stats.begin_phase(f"delta={scaling_factor}")
         while demand > 0:
+            if stats is not None:
+                stats.searches += 1
             # Find shortest path using Bellman-Ford modified for capacity scaling
             dist = {node: float('inf') for node in graph.adjacency_list.keys()}
             parent = {node: None for node in graph.adjacency_list.keys()}
@@ -21,11 +36,16 @@ def successive_shortest_paths_capacity_scaling(graph, source, sink, demand):
 
             for _ in range(len(graph.adjacency_list) - 1):
                 for u in graph.adjacency_list.keys():
+                    if stats is not None:
+                        stats.nodes_scanned += 1
+                        stats.arcs_scanned += len(graph.adjacency_list[u])
                     for edge in graph.adjacency_list[u]:
                         # Only consider edges with capacity >= scaling factor
                         if edge.capacity - edge.flow >= scaling_factor and dist[u] + edge.cost < dist[edge.to_node]:
                             dist[edge.to_node] = dist[u] + edge.cost
                             parent[edge.to_node] = (u, edge)
+                            if stats is not None:
+                                stats.relaxations += 1
 
             # Check if sink is reachable with current scaling factor
             if dist[sink] == float('inf'):
@@ -54,18 +74,25 @@ def successive_shortest_paths_capacity_scaling(graph, source, sink, demand):
             total_flow += path_flow
             demand -= path_flow
             augmenting_paths += 1
-            path_lengths.append(path_length)
+            nodes = [source] + [edge.to_node for edge in path] if path_lengths.keep_paths else None
+            path_lengths.add(path_length, nodes)
+            if stats is not None:
+                stats.augmentations += 1
 
         # Reduce scaling factor
         scaling_factor //= 2
+        if graph.residual and scaling_factor >= 1 and demand > 0:
+            total_cost += cancel_negative_cycles(graph, scaling_factor, stats)
+
+    # A demand met before the delta=1 phase, or a fractional last push, leaves the flow
+    # optimal only over the arcs of the last phase
+    if graph.residual and demand <= 0:
+        total_cost += cancel_negative_cycles(graph, min_residual, stats)
 
     # Calculate metrics
     if demand > 0:
         return None, -1, None, None, None  # Failure: Not enough flow to satisfy demand
     else:
-        num_paths = len(path_lengths)
-        mean_length = sum(path_lengths) / num_paths if num_paths > 0 else 0
-        longest_path = len(graph.adjacency_list.keys()) - 1
-        mean_proportional_length = mean_length / longest_path if longest_path > 0 else 0
+        mean_length, mean_proportional_length = path_length_metrics(path_lengths, graph, source, mpl_mode)
 
         return total_flow, total_cost, augmenting_paths, mean_length, mean_proportional_length
\ No newline at end of file
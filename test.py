@@ -1,5 +1,7 @@
-import random
+import argparse
 import os
+import random
+from array import array
 
 
 def generate_small_graphs():
@@ -85,67 +87,73 @@ def generate_boundary_graphs():
                 f.write(f"{u} {v} {cap} {cost}\n")
 
 
-def generate_random_graphs(num_graphs=10, sizes=[50, 100], densities=[0.1, 0.2]):
-    """Generate random graphs with varying characteristics."""
-    os.makedirs("Tests/RandomGraphs", exist_ok=True)
+def random_edge_columns(size, density, rng=random, upper_cap=100, upper_cost=50):
+    """
+    int(size * size * density) distinct edges without self-loops, as (tails, heads, capacities, costs).
+    The edges are a sample without replacement of the size * (size - 1) ordered pairs,
+    drawn as pair indices, so no edge is ever rejected or compared with the others.
+    """
+    edge_count = int(size * size * density)
+    num_pairs = size * (size - 1)
+    if edge_count > num_pairs:
+        raise ValueError(f"{edge_count} edges do not fit in a simple graph on {size} nodes")
+
+    tails, heads = array('q'), array('q')
+    for k in rng.sample(range(num_pairs), edge_count):
+        u, w = divmod(k, size - 1)
+        tails.append(u)
+        heads.append(w + (w >= u))  # Skip the self-loop (u, u)
+    capacities = array('q', (rng.randint(1, upper_cap) for _ in range(edge_count)))
+    costs = array('q', (rng.randint(1, upper_cost) for _ in range(edge_count)))
+    return tails, heads, capacities, costs
+
+
+def write_edge_columns(columns, folder_path, filename, binary=False):
+    """
+    Writes edge columns as a "u v capacity cost" edge list, or with binary=True as a binary
+    graph file (graph_io) with the extension replaced by .mcfg. Returns the file path.
+    """
+    from graph_io import save_edge_columns_binary
+
+    if binary:
+        path = os.path.join(folder_path, os.path.splitext(filename)[0] + ".mcfg")
+        save_edge_columns_binary(*columns, path)
+        return path
+
+    os.makedirs(folder_path, exist_ok=True)
+    path = os.path.join(folder_path, filename)
+    with open(path, 'w') as f:
+        f.writelines(f"{u} {v} {cap} {cost}\n" for u, v, cap, cost in zip(*columns))
+    return path
+
+
+def generate_random_graphs(num_graphs=10, sizes=(50, 100), densities=(0.1, 0.2), seed=None, binary=False):
+    """
+    Generate random graphs with varying characteristics.
+    seed: seeds a private RNG (None draws from the global random module).
+    """
+    rng = random if seed is None else random.Random(seed)
 
     for size in sizes:
         for density in densities:
             for i in range(num_graphs):
-                # Manually create random graph
-                edges = []
-                edge_count = int(size * size * density)
-
-                for _ in range(edge_count):
-                    u = random.randint(0, size - 1)
-                    v = random.randint(0, size - 1)
-
-                    # Avoid self-loops and duplicate edges
-                    while u == v or any(edge[0] == u and edge[1] == v for edge in edges):
-                        u = random.randint(0, size - 1)
-                        v = random.randint(0, size - 1)
-
-                    capacity = random.randint(1, 100)
-                    cost = random.randint(1, 50)
-                    edges.append((u, v, capacity, cost))
-
+                columns = random_edge_columns(size, density, rng)
                 filename = f"random_graph_n{size}_d{density}_{i}.edges"
-                path = os.path.join("Tests/RandomGraphs", filename)
+                write_edge_columns(columns, "Tests/RandomGraphs", filename, binary)
 
-                with open(path, 'w') as f:
-                    for u, v, cap, cost in edges:
-                        f.write(f"{u} {v} {cap} {cost}\n")
 
-
-def generate_stress_test_graphs(num_graphs=5):
-    """Generate large graphs for stress testing."""
-    os.makedirs("Tests/StressTests", exist_ok=True)
+def generate_stress_test_graphs(num_graphs=5, size=500, density=0.1, seed=None, binary=False):
+    """
+    Generate large graphs for stress testing.
+    Sizes up to 10^5 nodes work with a density that keeps the edge count in memory
+    (e.g. size=100000, density=1e-4 gives 10^6 edges).
+    """
+    rng = random if seed is None else random.Random(seed)
 
     for i in range(num_graphs):
-        size = 500
-        density = 0.1
-        edges = []
-        edge_count = int(size * size * density)
-
-        for _ in range(edge_count):
-            u = random.randint(0, size - 1)
-            v = random.randint(0, size - 1)
-
-            # Avoid self-loops and duplicate edges
-            while u == v or any(edge[0] == u and edge[1] == v for edge in edges):
-                u = random.randint(0, size - 1)
-                v = random.randint(0, size - 1)
-
-            capacity = random.randint(1, 100)
-            cost = random.randint(1, 50)
-            edges.append((u, v, capacity, cost))
-
+        columns = random_edge_columns(size, density, rng)
         filename = f"stress_test_graph_{i}.edges"
-        path = os.path.join("Tests/StressTests", filename)
-
-        with open(path, 'w') as f:
-            for u, v, cap, cost in edges:
-                f.write(f"{u} {v} {cap} {cost}\n")
+        write_edge_columns(columns, "Tests/StressTests", filename, binary)
 
 
 def generate_special_graphs():
@@ -186,14 +194,21 @@ def generate_special_graphs():
                 f.write(f"{u} {v} {cap} {cost}\n")
 
 
-def main():
+def main(seed=None, stress_size=500, stress_density=0.1, binary=False):
     generate_small_graphs()
     generate_boundary_graphs()
-    generate_random_graphs()
-    generate_stress_test_graphs()
+    generate_random_graphs(seed=seed, binary=binary)
+    generate_stress_test_graphs(size=stress_size, density=stress_density,
+                                seed=None if seed is None else seed + 1, binary=binary)
     generate_special_graphs()
     print("Test graph generation complete!")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Generate the test graph tiers under Tests/.")
+    parser.add_argument("--seed", type=int, help="seed for the random and stress tiers")
+    parser.add_argument("--stress-size", type=int, default=500, help="nodes per stress graph (up to 10^5)")
+    parser.add_argument("--stress-density", type=float, default=0.1, help="edges per ordered node pair")
+    parser.add_argument("--binary", action="store_true", help="write random/stress graphs as binary .mcfg files")
+    args = parser.parse_args()
+    main(args.seed, args.stress_size, args.stress_density, args.binary)
\ No newline at end of file
@@ -0,0 +1,43 @@
+"""
+The "reachable" LCC has to pick the same set, in the same order, as one full search per node.
+"""
+import pytest
+
+from connectivity import depth_first_order, largest_component
+from graph import Graph
+from graph_io import edge_columns
+from source_sink_graph_generator import generate_sink_source_graph
+
+
+def every_start(graph):
+    """The first largest reachable set, searching again from every node."""
+    largest = []
+    for node in list(graph.adjacency_list.keys()):
+        component = depth_first_order(graph, node, set())
+        if len(component) > len(largest):
+            largest = component
+    return largest
+
+
+def chain(residual=False):
+    """1 -> 2 -> 3 -> 4, added tail first, so each later node reaches more than the one before."""
+    graph = Graph(residual=residual)
+    for u in (3, 2, 1):
+        graph.add_edge(u, u + 1, 1, 1)
+    return graph
+
+
+@pytest.mark.parametrize("residual", [False, True])
+def test_chain(residual):
+    assert largest_component(chain(residual)) == every_start(chain(residual)) == [1, 2, 3, 4]
+
+
+@pytest.mark.parametrize("n, r, seed", [(60, 0.05, 1), (80, 0.1, 2), (100, 0.2, 3), (120, 0.3, 4)])
+def test_generated_graphs(n, r, seed):
+    def build():
+        graph = Graph()
+        for u, v, capacity, cost in zip(*edge_columns(generate_sink_source_graph(n, r, 8, 5, seed))):
+            graph.add_edge(u, v, capacity, cost)
+        return graph
+
+    assert largest_component(build(), "reachable") == every_start(build())
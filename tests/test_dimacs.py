@@ -0,0 +1,75 @@
+"""
+DIMACS .min instances: supplies, lower bounds and circulations.
+"""
+import contextlib
+import io
+
+import pytest
+
+from dimacs import read_dimacs_min
+from primal_dual_algorithm import primal_dual_algorithm
+from successive_shortest_paths import successive_shortest_paths
+
+TWO_PATHS = """c 3 units from 1 to 4, over paths of cost 2 and 3
+p min 4 4
+n 1 3
+n 4 -3
+a 1 2 0 2 1
+a 1 3 0 2 2
+a 2 4 0 2 1
+a 3 4 0 2 1
+"""
+
+# The cheap path 1-2-3-4 blocks both cheap arcs; the optimum reroutes over 1-3 and 2-4
+REROUTE = """p min 4 5
+n 1 2
+n 4 -2
+a 1 2 0 1 1
+a 2 3 0 1 1
+a 3 4 0 1 1
+a 1 3 0 1 5
+a 2 4 0 1 5
+"""
+
+CIRCULATION = """p min 3 3
+a 1 2 0 5 1
+a 2 3 0 5 1
+a 3 1 0 5 -4
+"""
+
+
+def read(tmp_path, text, **kwargs):
+    path = tmp_path / "instance.min"
+    path.write_text(text)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return read_dimacs_min(str(path), **kwargs)
+
+
+@pytest.mark.parametrize("algorithm", [successive_shortest_paths, primal_dual_algorithm])
+def test_single_supply_and_demand(tmp_path, algorithm):
+    instance = read(tmp_path, TWO_PATHS)
+    assert (instance.source, instance.sink, instance.demand) == (1, 4, 3)
+    with contextlib.redirect_stdout(io.StringIO()):
+        flow, cost = instance.solve(algorithm)[:2]
+    assert (flow, cost) == (3, 7)
+
+
+def test_residual_by_default(tmp_path):
+    instance = read(tmp_path, REROUTE)
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert instance.solve(successive_shortest_paths)[:2] == (2, 12)
+        assert read(tmp_path, REROUTE, residual=False).solve(successive_shortest_paths)[:2] == (None, -1)
+
+
+def test_solve_starts_from_zero_flow(tmp_path):
+    instance = read(tmp_path, REROUTE)
+    with contextlib.redirect_stdout(io.StringIO()):
+        first = instance.solve(primal_dual_algorithm)
+        assert instance.solve(successive_shortest_paths)[:2] == instance.solve(primal_dual_algorithm)[:2] == first[:2]
+
+
+def test_circulation_is_rejected(tmp_path):
+    instance = read(tmp_path, CIRCULATION)
+    assert (instance.source, instance.sink, instance.demand) == (None, None, 0)
+    with pytest.raises(ValueError, match="circulation"):
+        instance.solve(successive_shortest_paths)
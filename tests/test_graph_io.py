@@ -0,0 +1,74 @@
+"""
+Binary graph files: CSR round trips, mapped topology and the version 1 edge-column format.
+"""
+import contextlib
+import io
+
+import pytest
+
+from csr_graph import CSRGraph
+from graph_io import (_HEADER, _column_bytes, convert_binary_to_text, edge_columns, load_csr_graph_binary,
+                      load_edge_columns_binary, read_binary_header, save_edge_columns_binary, save_graph_binary)
+from source_sink_graph_generator import generate_sink_source_graph
+from utility import load_graph_from_file
+
+TOPOLOGY = ("labels", "first_out", "first_back", "head", "tail", "rev", "base_capacity", "cost", "forward_arcs")
+
+
+@pytest.fixture(scope="module")
+def columns():
+    return tuple(list(column) for column in edge_columns(generate_sink_source_graph(80, 0.3, 16, 10, 5)))
+
+
+def load(function, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return function(*args, **kwargs)
+
+
+def test_csr_round_trip(tmp_path, columns):
+    path = str(tmp_path / "graph.mcfg")
+    save_edge_columns_binary(*columns, path)
+    graph = load(load_csr_graph_binary, path, residual=True)
+    expected = CSRGraph.from_arrays(*columns)
+    for name in TOPOLOGY:
+        assert isinstance(getattr(graph, name), memoryview)  # Mapped, not copied
+        assert list(getattr(graph, name)) == list(getattr(expected, name))
+    assert graph.residual
+    assert [list(column) for column in load_edge_columns_binary(path)] == list(columns)
+
+
+def test_text_conversion_and_graph_load(tmp_path, columns):
+    binary_path, text_path = str(tmp_path / "graph.mcfg"), str(tmp_path / "graph.txt")
+    save_edge_columns_binary(*columns, binary_path)
+    convert_binary_to_text(binary_path, text_path)
+    for path in (binary_path, text_path):
+        graph = load(load_graph_from_file, path)
+        assert [list(column) for column in edge_columns(graph)] == list(columns)
+
+
+def test_labels_widths_and_negative_costs(tmp_path):
+    edges = [(10, 2 ** 40, 3, -2), (2 ** 40, 7, 2, 4), (10, 7, 1, 1)]
+    path = str(tmp_path / "graph.mcfg")
+    save_graph_binary(CSRGraph.from_edges(edges), path)
+    assert read_binary_header(path) == (3, 3, 8, 4)
+    graph = load(load_csr_graph_binary, path)
+    assert [(e.from_node, e.to_node, e.capacity, e.cost) for e in graph.edges] == edges
+
+
+def test_version_1_edge_columns(tmp_path, columns):
+    path = str(tmp_path / "graph.mcfg")
+    with open(path, 'wb') as f:
+        f.write(_HEADER.pack(b"MCFG", 1, 4, 4, len(set(columns[0]) | set(columns[1])), len(columns[0])))
+        for column in columns:
+            f.write(_column_bytes(column, 'i'))
+    assert [list(column) for column in load_edge_columns_binary(path)] == list(columns)
+    graph = load(load_csr_graph_binary, path)
+    assert list(graph.head) == list(CSRGraph.from_arrays(*columns).head)
+
+
+def test_truncated_file(tmp_path, columns):
+    path = tmp_path / "graph.mcfg"
+    save_edge_columns_binary(*columns, str(path))
+    path.write_bytes(path.read_bytes()[:-64])
+    with pytest.raises(ValueError, match="truncated"):
+        load_csr_graph_binary(str(path))
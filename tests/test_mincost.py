@@ -0,0 +1,153 @@
+"""
+Cross-checks of the min-cost flow solvers: on the residual graph every method has
+to reach the same flow and the same (optimal) cost.
+"""
+import contextlib
+import io
+
+import pytest
+
+from capacity_scaling import capacity_scaling_with_metrics
+from cost_scaling import cost_scaling
+from csr_graph import CSRGraph
+from graph import Graph
+from graph_io import edge_columns
+from max_flow import maximum_flow
+from network_simplex import network_simplex
+from primal_dual_algorithm import primal_dual_algorithm
+from source_sink_graph_generator import generate_sink_source_graph
+from successive_shortest_paths import bellman_ford, dijkstra_with_potentials, successive_shortest_paths
+from successive_shortest_paths_capacity_scaling import successive_shortest_paths_capacity_scaling
+
+# (n, r, upperCap, upperCost, seed)
+INSTANCES = [
+    (60, 0.3, 8, 5, 1),
+    (60, 0.3, 64, 20, 2),
+    (80, 0.25, 16, 10, 3),
+    (80, 0.3, 128, 40, 4),
+]
+
+
+def build_instance(n, r, upper_cap, upper_cost, seed, residual=True):
+    """A generated graph with its source, sink and fmax, picked as main.py does."""
+    graph = Graph(residual=residual)
+    for u, v, capacity, cost in zip(*edge_columns(generate_sink_source_graph(n, r, upper_cap, upper_cost, seed))):
+        graph.add_edge(u, v, capacity, cost)
+    analysis = graph.analysis("reachable")
+    fmax = maximum_flow(graph, analysis.source, analysis.sink, "dinic")
+    return graph, analysis.source, analysis.sink, fmax
+
+
+def solve(algorithm, graph, source, sink, demand, **kwargs):
+    """Runs algorithm from zero flow with its progress output suppressed."""
+    graph.reset_flows()
+    with contextlib.redirect_stdout(io.StringIO()):
+        return algorithm(graph, source, sink, demand, **kwargs)
+
+
+@pytest.fixture(scope="module", params=INSTANCES, ids=lambda p: "n{}_r{}_cap{}_cost{}_seed{}".format(*p))
+def instance(request):
+    return build_instance(*request.param)
+
+
+@pytest.fixture(params=["integer", "fractional"])
+def demand(request, instance):
+    fmax = instance[3]
+    return int(0.95 * fmax) if request.param == "integer" else 0.95 * fmax
+
+
+def reference_cost(instance, demand):
+    graph, source, sink, _ = instance
+    flow, cost, _, _, _ = solve(successive_shortest_paths, graph, source, sink, demand)
+    assert flow == pytest.approx(demand)
+    return cost
+
+
+@pytest.mark.parametrize("algorithm", [capacity_scaling_with_metrics, successive_shortest_paths_capacity_scaling])
+def test_residual_capacity_scaling_is_optimal(instance, demand, algorithm):
+    graph, source, sink, _ = instance
+    flow, cost, _, _, _ = solve(algorithm, graph, source, sink, demand)
+    assert flow == pytest.approx(demand)
+    assert cost == pytest.approx(reference_cost(instance, demand))
+    ns_cost = solve(network_simplex, graph, source, sink, demand)[1]
+    assert cost == pytest.approx(ns_cost)
+
+
+def test_dijkstra_potentials_match_bellman_ford(instance, demand):
+    # Only the cost: ties between equal-cost paths break differently, so paths and ML can
+    # differ, and on forward-only graphs the greedy costs can differ as well
+    graph, source, sink, _ = instance
+    flow, cost, _, _, _ = solve(successive_shortest_paths, graph, source, sink, demand, method="dijkstra")
+    assert flow == pytest.approx(demand)
+    assert cost == pytest.approx(reference_cost(instance, demand))
+
+
+def test_dijkstra_distances_match_bellman_ford(instance):
+    graph, source, sink, _ = instance
+    graph.reset_flows()
+    distance, _ = bellman_ford(graph, source)
+    potential = {node: d if d != float('inf') else 0 for node, d in distance.items()}
+    reduced, _, _ = dijkstra_with_potentials(graph, source, None, potential)
+    for node, d in reduced.items():
+        # Reduced distances shift back by the potentials of the two endpoints
+        assert d + potential[node] - potential[source] == pytest.approx(distance[node])
+    assert set(reduced) == {node for node, d in distance.items() if d != float('inf')}
+
+
+@pytest.mark.parametrize("method", ["path", "blocking"])
+def test_residual_primal_dual_is_optimal(instance, demand, method):
+    # On forward-only graphs every method is greedy and may legitimately end elsewhere
+    graph, source, sink, _ = instance
+    flow, cost, _, _, _ = solve(primal_dual_algorithm, graph, source, sink, demand, method=method)
+    assert flow == pytest.approx(demand)
+    assert cost == pytest.approx(reference_cost(instance, demand))
+
+
+def test_blocking_primal_dual_matches_path_primal_dual(instance, demand):
+    graph, source, sink, _ = instance
+    path_result = solve(primal_dual_algorithm, graph, source, sink, demand, method="path")
+    blocking_result = solve(primal_dual_algorithm, graph, source, sink, demand, method="blocking")
+    assert blocking_result[0] == pytest.approx(path_result[0])
+    assert blocking_result[1] == pytest.approx(path_result[1])
+
+
+# (u, v, capacity, cost) of a graph on which Dijkstra pops the sink 1 before reaching node 4.
+# Moving the reached nodes by their full distance gave arc 4 -> 1 a negative reduced cost,
+# and path-mode PD then sent 7 units from 0 to 1 at cost 17 instead of 16
+EARLY_SINK_EDGES = [
+    (0, 5, 4, 0), (0, 9, 3, 0), (2, 1, 7, 2), (3, 2, 6, 0), (4, 1, 1, 0), (5, 6, 4, 0), (5, 7, 1, 0), (6, 3, 1, 0),
+    (6, 7, 5, 0), (7, 3, 5, 0), (7, 8, 1, 1), (8, 2, 1, 0), (8, 4, 1, 1), (9, 5, 1, 0), (9, 6, 2, 1),
+]
+
+
+@pytest.mark.parametrize("graph_type", [Graph, CSRGraph])
+@pytest.mark.parametrize("method", ["path", "blocking"])
+def test_primal_dual_potentials_after_early_sink(graph_type, method):
+    if graph_type is Graph:
+        graph = Graph(residual=True)
+        for edge in EARLY_SINK_EDGES:
+            graph.add_edge(*edge)
+    else:
+        graph = CSRGraph.from_edges(EARLY_SINK_EDGES, residual=True)
+    flow, cost, _, _, _ = solve(primal_dual_algorithm, graph, 0, 1, 7, method=method)
+    assert (flow, cost) == (7, 16)
+    assert solve(successive_shortest_paths, graph, 0, 1, 7)[:2] == (7, 16)
+
+
+@pytest.mark.parametrize("block_size", [None, 1, 10**9], ids=["sqrt_m", "first_eligible", "full_scan"])
+def test_network_simplex_matches_ssp(instance, demand, block_size):
+    graph, source, sink, _ = instance
+    flow, cost, _, _, _ = solve(network_simplex, graph, source, sink, demand, block_size=block_size)
+    assert flow == pytest.approx(demand)
+    assert cost == pytest.approx(reference_cost(instance, demand))
+
+
+@pytest.mark.parametrize("algorithm", [network_simplex, cost_scaling])
+def test_residual_solvers_ignore_graph_mode(algorithm):
+    # Both always solve on the full residual graph, so a forward-only graph gives the same optimum
+    for n, r, upper_cap, upper_cost, seed in INSTANCES:
+        graph, source, sink, fmax = build_instance(n, r, upper_cap, upper_cost, seed, residual=False)
+        demand = int(0.95 * fmax)
+        flow, cost, _, _, _ = solve(algorithm, graph, source, sink, demand)
+        assert flow == pytest.approx(demand)
+        assert cost == pytest.approx(reference_cost(build_instance(n, r, upper_cap, upper_cost, seed), demand))
@@ -1,16 +1,26 @@
 from collections import defaultdict, deque
 
+from results_writer import algorithm_row, ford_fulkerson_row, format_algorithm_row, format_ford_fulkerson_row
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the edge list parser falls back to pure Python
+    np = None
+
 
 # ----------------- Ford-Fulkerson (Edmonds-Karp) ----------------- #
-def ford_fulkerson_edmonds_karp(graph, source, sink):
+def ford_fulkerson_edmonds_karp(graph, source, sink, stats=None):
     """
     Ford-Fulkerson Maximum Flow using Edmonds-Karp algorithm (BFS).
+    stats: optional instrumentation.SolverStats that counts the work done.
     """
     max_flow = 0
     residual_graph = create_residual_graph(graph)
 
     while True:
-        path_flow, parent = bfs_for_flow(residual_graph, source, sink)
+        if stats is not None:
+            stats.searches += 1
+        path_flow, parent = bfs_for_flow(residual_graph, source, sink, stats)
         if path_flow == 0:
             break
 
@@ -19,15 +29,12 @@ def ford_fulkerson_edmonds_karp(graph, source, sink):
         while v != source:
             u, edge = parent[v]
             edge['capacity'] -= path_flow
-
-            # Update reverse edge
-            for reverse_edge in residual_graph[v]:
-                if reverse_edge['to'] == u:
-                    reverse_edge['capacity'] += path_flow
-                    break
+            edge['reverse']['capacity'] += path_flow
             v = u
 
         max_flow += path_flow
+        if stats is not None:
+            stats.augmentations += 1
 
     return max_flow, residual_graph
 
@@ -35,17 +42,21 @@ def ford_fulkerson_edmonds_karp(graph, source, sink):
 def create_residual_graph(graph):
     """
     Builds the residual graph from the original graph.
+    Every edge gets its own backward arc; the two point at each other through 'reverse'.
     """
     residual_graph = defaultdict(list)
-    for u in graph.adjacency_list:
-        for edge in graph.adjacency_list[u]:
-            residual_graph[u].append({'to': edge.to_node, 'capacity': edge.capacity, 'cost': edge.cost})
-            if not any(e['to'] == u for e in residual_graph[edge.to_node]):
-                residual_graph[edge.to_node].append({'to': u, 'capacity': 0, 'cost': -edge.cost})
+    for edge in graph.edges:
+        u, v = edge.from_node, edge.to_node
+        forward = {'to': v, 'capacity': edge.capacity, 'cost': edge.cost}
+        backward = {'to': u, 'capacity': 0, 'cost': -edge.cost}
+        forward['reverse'] = backward
+        backward['reverse'] = forward
+        residual_graph[u].append(forward)
+        residual_graph[v].append(backward)
     return residual_graph
 
 
-def bfs_for_flow(graph, source, sink):
+def bfs_for_flow(graph, source, sink, stats=None):
     """
     Breadth-First Search to find an augmenting path in the residual graph.
     """
@@ -57,6 +68,9 @@ def bfs_for_flow(graph, source, sink):
         current, flow = queue.popleft()
         if current == sink:
             return flow, parent
+        if stats is not None:
+            stats.nodes_scanned += 1
+            stats.arcs_scanned += len(graph[current])
 
         for edge in graph[current]:
             next_node = edge['to']
@@ -64,6 +78,8 @@ def bfs_for_flow(graph, source, sink):
 
             if next_node not in visited and capacity > 0:
                 visited.add(next_node)
+                if stats is not None:
+                    stats.relaxations += 1
                 parent[next_node] = (current, edge)
                 next_flow = min(flow, capacity)
                 queue.append((next_node, next_flow))
@@ -80,11 +96,18 @@ def calculate_graph_metrics(graph, lcc):
     out_degree = defaultdict(int)
 
     for u in graph.adjacency_list:
-        for edge in graph.adjacency_list[u]:
+        for edge in graph.out_edges(u):
             v = edge.to_node
             out_degree[u] += 1
             in_degree[v] += 1
 
+    return lcc_metrics(lcc, out_degree, in_degree)
+
+
+def lcc_metrics(lcc, out_degree, in_degree):
+    """
+    LCC metrics from precomputed degree tables.
+    """
     max_out_degree = max(out_degree[node] for node in lcc)
     max_in_degree = max(in_degree[node] for node in lcc)
     num_nodes = len(lcc)
@@ -101,87 +124,235 @@ def calculate_graph_metrics(graph, lcc):
 
 
 # ----------------- Write Results to File ----------------- #
-def run_ford_fulkerson_and_write_results(graph, source, sink, file_path, filename):
+def run_ford_fulkerson_and_write_results(graph, source, sink, file_path, filename, lcc_mode="reachable", analysis=None,
+                                        method="edmonds_karp", writer=None):
     """
-    Runs Ford-Fulkerson (Edmonds-Karp), calculates metrics, writes results, and returns fmax.
+    Runs a max-flow engine (Edmonds-Karp by default, see max_flow.maximum_flow for the others),
+    calculates metrics, writes results, and returns fmax.
+    Metrics come from the graph's cached GraphAnalysis unless one is passed in.
+    With a results_writer.ResultWriter the row is buffered there instead of appended to file_path.
     """
-    max_flow, residual_graph = ford_fulkerson_edmonds_karp(graph, source, sink)
-    lcc = find_largest_connected_component(graph)
-    metrics = calculate_graph_metrics(graph, lcc)
-
-    try:
-        parts = filename.split('_')
-        graph_id = parts[1]
-        n = parts[2][1:]
-        r = parts[3][1:]
-        upper_cap = parts[4][3:]
-        upper_cost = parts[5][4:].split('.')[0]
-    except Exception as e:
-        print(f"Error parsing filename '{filename}'")
-        graph_id , n, r, upper_cap, upper_cost = filename, "N/A", "N/A", "N/A", "N/A"
-
-    result_format = "{:<10}\t{:<5}\t{:<5}\t{:<10}\t{:<10}\t{:<10}\t{:<10}\t{:<12}\t{:<12}\t{:<10.4f}\n"
+    from max_flow import maximum_flow
 
+    max_flow = maximum_flow(graph, source, sink, method)
+    if analysis is None:
+        analysis = graph.analysis(lcc_mode)
+    write_ford_fulkerson_results(max_flow, analysis.metrics, file_path, filename, writer)
+    return max_flow
 
 
-    with open(file_path, 'a', encoding='utf-8') as results:
-            results.write(result_format.format(
-                graph_id, n, r, upper_cap, upper_cost,
-                max_flow,
-                metrics['|VLCC|'],
-                metrics['∆out(LCC)'],
-                metrics['∆in(LCC)'],
-                metrics['k(LCC)']
-            ))
-            print(f"Processed {filename} | fmax: {max_flow}, Metrics: {metrics}")
+def write_ford_fulkerson_results(max_flow, metrics, file_path, filename, writer=None):
+    """
+    Appends one fmax/metrics row for a graph file to the results file, or buffers it
+    in writer (a results_writer.ResultWriter) when one is given.
+    """
+    row = ford_fulkerson_row(max_flow, metrics, filename)
+    if row["graph_id"] is None:
+        print(f"Error parsing filename '{filename}'")
 
-    return max_flow
+    if writer is not None:
+        writer.add(row)
+    else:
+        with open(file_path, 'a', encoding='utf-8') as results:
+            results.write(format_ford_fulkerson_row(row) + "\n")
+    print(f"Processed {filename} | fmax: {max_flow}, Metrics: {metrics}")
 
 
 # ----------------- LCC Finder ----------------- #
-def find_largest_connected_component(graph):
+def find_largest_connected_component(graph, mode="reachable"):
     """
-    Finds the largest connected component using DFS.
+    Finds the largest connected component; see connectivity.largest_component for the modes.
+    The default "reachable" takes the largest set reachable from one node, starting from that node.
     """
-    visited = set()
-    largest_component = []
+    from connectivity import largest_component
 
-    def dfs(node, component):
-        component.append(node)
-        for edge in graph.adjacency_list[node]:
-            if edge.to_node not in component:
-                dfs(edge.to_node, component)
+    return largest_component(graph, mode)
 
-    for node in list(graph.adjacency_list.keys()):
-        if node not in visited:
-            component = []
-            visited.add(node)
-            dfs(node, component)
-            if len(component) > len(largest_component):
-                largest_component = component
 
-    return largest_component
+# ----------------- Graph Loader ----------------- #
+# Bytes read per chunk; each chunk is parsed in bulk
+EDGE_CHUNK_SIZE = 1 << 24
 
 
-# ----------------- Graph Loader ----------------- #
-def load_graph_from_file(filename):
+def load_graph_from_file(filename, residual=False, workers=1):
     """
-    Loads a graph from a file into a Graph object.
+    Loads a graph from a text edge list or a binary graph file into a Graph object.
+    Raises FileNotFoundError for a missing file and ValueError for a malformed line.
     """
     from graph import Graph
+    from graph_io import is_binary_graph_file, load_edge_columns_binary
 
-    graph = Graph()
-    try:
-        with open(filename, 'r') as f:
-            for line in f:
-                u, v, capacity, cost = map(int, line.strip().split())
-                graph.add_edge(u, v, capacity, cost)
-        print(f"Graph loaded successfully from {filename}")
-    except FileNotFoundError:
-        print(f"Error: File {filename} not found.")
+    if is_binary_graph_file(filename):
+        columns = load_edge_columns_binary(filename)
+    else:
+        columns = load_edge_columns_from_file(filename, workers)
+
+    graph = Graph(residual=residual)
+    for u, v, capacity, cost in zip(*columns):
+        graph.add_edge(u, v, capacity, cost)
+    print(f"Graph loaded successfully from {filename}")
     return graph
 
 
+def _parse_edge_chunk(data):
+    """
+    Parses complete "u v capacity cost" lines (data ends with a newline).
+    Returns (values, lines, error): values holds 4 integers per edge, and error is
+    None or (index of the first malformed line in data, its text).
+    """
+    from array import array
+
+    lines = data.count(b'\n')
+    if np is not None:
+        values = _parse_edge_chunk_numpy(data, lines)
+        if values is not None:
+            return values, lines, None
+
+    # Fast path: a ';' marks every line end, so 4 fields per line means every 5th token is ';'
+    tokens = data.replace(b'\n', b' ; ').split()
+    if len(tokens) == 5 * lines and tokens[4::5].count(b';') == lines:
+        del tokens[4::5]
+        try:
+            return array('q', map(int, tokens)), lines, None
+        except (ValueError, OverflowError):
+            pass
+
+    # Slow path: blank lines are skipped, anything else is reported
+    values = array('q')
+    for index, line in enumerate(data.split(b'\n')[:lines]):
+        fields = line.split()
+        if not fields:
+            continue
+        try:
+            if len(fields) != 4:
+                raise ValueError
+            values.extend(array('q', map(int, fields)))
+        except (ValueError, OverflowError):
+            return values, index, (index, line.decode(errors='replace').strip())
+    return values, lines, None
+
+
+def _parse_edge_chunk_numpy(data, lines):
+    """
+    NumPy version of the fast path: every line must hold exactly 4 integers.
+    Returns the values as an array('q'), or None to fall back to the line-by-line parser.
+    """
+    import warnings
+    from array import array
+
+    raw = np.frombuffer(data, dtype=np.uint8)
+    if not len(raw):
+        return array('q')
+
+    # Count the tokens that start before each newline
+    space = raw <= 32
+    starts = np.flatnonzero(~space[1:] & space[:-1]) + 1
+    if not space[0]:
+        starts = np.concatenate(([0], starts))
+    ends = np.flatnonzero(raw == 10)
+    if len(starts) != 4 * lines or np.any(np.diff(np.searchsorted(starts, ends), prepend=0) != 4):
+        return None
+
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")  # Older NumPy only warns when it stops at a bad token
+            values = np.fromstring(data, dtype=np.int64, sep=' ')
+    except ValueError:
+        return None
+    if len(values) != 4 * lines:
+        return None
+    return array('q', values.tobytes())
+
+
+def _parse_edge_range(filename, start, end, chunk_size=EDGE_CHUNK_SIZE):
+    """
+    Parses the lines that start in bytes [start, end) of an edge list.
+    Returns (tails, heads, capacities, costs, lines, error); see _parse_edge_chunk for error.
+    """
+    from array import array
+
+    columns = (array('q'), array('q'), array('q'), array('q'))
+    lines = 0
+    with open(filename, 'rb') as f:
+        if start > 0:
+            f.seek(start - 1)
+            f.readline()  # The line running through start belongs to the previous range
+        position = f.tell()
+        pending = b''
+        while position < end:
+            data = f.read(min(chunk_size, end - position))
+            if not data:
+                end = position  # The file is shorter than expected
+            position += len(data)
+            data = pending + data
+            if position >= end:
+                if data and not data.endswith(b'\n'):
+                    data += f.readline()  # Finish the last line of the range
+                    if not data.endswith(b'\n'):
+                        data += b'\n'
+                pending = b''
+            else:
+                cut = data.rfind(b'\n') + 1
+                data, pending = data[:cut], data[cut:]
+
+            values, parsed, error = _parse_edge_chunk(data)
+            for k in range(4):
+                columns[k].extend(values[k::4])
+            if error is not None:
+                return (*columns, lines + parsed, (lines + error[0], error[1]))
+            lines += parsed
+
+    return (*columns, lines, None)
+
+
+def load_edge_columns_from_file(filename, workers=1, chunk_size=EDGE_CHUNK_SIZE):
+    """
+    Reads a text edge list into (tails, heads, capacities, costs) arrays.
+
+    The file is read in chunk_size blocks and each block is parsed in bulk. With
+    workers > 1 the file is split into byte ranges that are parsed in parallel processes.
+    Raises ValueError naming the first malformed line.
+    """
+    import os
+    from array import array
+
+    size = os.path.getsize(filename)
+    if workers <= 1 or size < 2 * chunk_size:
+        ranges = [_parse_edge_range(filename, 0, size, chunk_size)]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        bounds = [size * i // workers for i in range(workers + 1)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            ranges = list(executor.map(_parse_edge_range, [filename] * workers, bounds[:-1], bounds[1:],
+                                       [chunk_size] * workers))
+
+    columns = (array('q'), array('q'), array('q'), array('q'))
+    lines = 0
+    for *range_columns, range_lines, error in ranges:
+        if error is not None:
+            index, text = error
+            raise ValueError(f"{filename}, line {lines + index + 1}: expected 'u v capacity cost', got {text!r}")
+        for column, part in zip(columns, range_columns):
+            column.extend(part)
+        lines += range_lines
+    return columns
+
+
+def load_csr_graph_from_file(filename, residual=False, workers=1):
+    """
+    Loads a text edge list or a binary graph file straight into a CSRGraph, without building Edge objects.
+    """
+    from csr_graph import CSRGraph
+    from graph_io import is_binary_graph_file, load_csr_graph_binary
+
+    if is_binary_graph_file(filename):
+        return load_csr_graph_binary(filename, residual)
+    columns = load_edge_columns_from_file(filename, workers)
+    print(f"Graph loaded successfully from {filename}")
+    return CSRGraph.from_arrays(*columns, residual)
+
+
 # ----------------- BFS Farthest Node ----------------- #
 def bfs_farthest_node(graph, source):
     visited = set([source])
@@ -197,7 +368,7 @@ def bfs_farthest_node(graph, source):
             max_distance = current_distance
             farthest_node = current
 
-        for edge in graph.adjacency_list[current]:
+        for edge in graph.out_edges(current):
             next_node = edge.to_node
 
             if next_node not in visited:
@@ -211,17 +382,38 @@ def bfs_farthest_node(graph, source):
     return farthest_node
 
 
-def bellman_ford_capacity_scaling(graph, source, sink, delta):
-    """Shortest path algorithm to find minimum-cost augmenting paths."""
+def bellman_ford_capacity_scaling(graph, source, sink, delta, method="bellman_ford", stats=None):
+    """
+    Shortest path algorithm to find minimum-cost augmenting paths.
+    method="bellman_ford" relaxes every arc per round and stops at the first round without changes.
+    method="spfa" keeps a FIFO queue and only relaxes the out-arcs of nodes whose distance changed.
+    Both raise ValueError if a negative-cost cycle is reachable from source.
+    """
     distance = {node: float('inf') for node in graph.adjacency_list}
     parent = {node: None for node in graph.adjacency_list}
     distance[source] = 0
 
-    for _ in range(len(graph.adjacency_list) - 1):
-        for edge in graph.edges:
-            if edge.capacity - edge.flow >= delta and distance[edge.from_node] + edge.cost < distance[edge.to_node]:
-                distance[edge.to_node] = distance[edge.from_node] + edge.cost
-                parent[edge.to_node] = edge
+    if method == "spfa":
+        _spfa_capacity_scaling(graph, source, delta, distance, parent, stats)
+    else:
+        # A change in round |V| means some shortest path has |V| arcs, i.e. a negative cycle
+        changed = False
+        for _ in range(len(graph.adjacency_list)):
+            changed = False
+            if stats is not None:
+                stats.nodes_scanned += len(graph.adjacency_list)
+                stats.arcs_scanned += len(graph.residual_edges)
+            for edge in graph.residual_edges:
+                if edge.capacity - edge.flow >= delta and distance[edge.from_node] + edge.cost < distance[edge.to_node]:
+                    distance[edge.to_node] = distance[edge.from_node] + edge.cost
+                    parent[edge.to_node] = edge
+                    changed = True
+                    if stats is not None:
+                        stats.relaxations += 1
+            if not changed:
+                break
+        if changed:
+            raise ValueError("Negative-cost cycle reachable from the source")
 
     # Check if sink is reachable
     if distance[sink] == float('inf'):
@@ -241,61 +433,164 @@ def bellman_ford_capacity_scaling(graph, source, sink, delta):
     return path, bottleneck
 
 
-def find_longest_acyclic_path(graph, source, sink):
-    """Find the longest acyclic path in a graph."""
-    visited = set()
-    stack = []
-
-    def dfs(node):
-        if node in visited:
-            return
-        visited.add(node)
-        for edge in graph.adjacency_list[node]:
-            if edge.capacity > 0:  # Only consider edges with positive capacity
-                dfs(edge.to_node)
-        stack.append(node)
+def _spfa_capacity_scaling(graph, source, delta, distance, parent, stats=None):
+    """Queue-based Bellman-Ford (SPFA) over arcs with residual capacity >= delta."""
+    num_nodes = len(graph.adjacency_list)
+    arcs_on_path = {source: 0}
+    queue = deque([source])
+    in_queue = {source}
 
-    dfs(source)
-    stack.reverse()
-
-    distances = {node: float('-inf') for node in graph.adjacency_list}
-    distances[source] = 0
-
-    for node in stack:
-        for edge in graph.adjacency_list[node]:
-            if edge.capacity > 0 and distances[node] + 1 > distances[edge.to_node]:
-                distances[edge.to_node] = distances[node] + 1
-
-    return distances[sink] if distances[sink] != float('-inf') else 0
+    while queue:
+        u = queue.popleft()
+        in_queue.discard(u)
+        if stats is not None:
+            stats.nodes_scanned += 1
+            stats.arcs_scanned += len(graph.adjacency_list[u])
+        for edge in graph.adjacency_list[u]:
+            v = edge.to_node
+            if edge.capacity - edge.flow >= delta and distance[u] + edge.cost < distance[v]:
+                distance[v] = distance[u] + edge.cost
+                parent[v] = edge
+                if stats is not None:
+                    stats.relaxations += 1
+                arcs_on_path[v] = arcs_on_path[u] + 1
+                if arcs_on_path[v] >= num_nodes:
+                    raise ValueError("Negative-cost cycle reachable from the source")
+                if v not in in_queue:
+                    in_queue.add(v)
+                    queue.append(v)
+
+
+def cancel_negative_cycles(graph, delta, stats=None):
+    """
+    Cancels negative-cost cycles made of arcs with residual capacity >= delta.
+    Needed between capacity-scaling phases on residual graphs: arcs that reappear
+    when delta shrinks can close negative cycles. Returns the resulting change in cost.
+    """
+    nodes = list(graph.adjacency_list.keys())
+    cost_change = 0
 
+    while True:
+        # Bellman-Ford from a virtual source connected to every node
+        distance = {node: 0 for node in nodes}
+        parent = {}
+        last_updated = None
+        for _ in range(len(nodes)):
+            last_updated = None
+            if stats is not None:
+                stats.nodes_scanned += len(nodes)
+                stats.arcs_scanned += len(graph.residual_edges)
+            for edge in graph.residual_edges:
+                if edge.capacity - edge.flow >= delta and distance[edge.from_node] + edge.cost < distance[edge.to_node]:
+                    distance[edge.to_node] = distance[edge.from_node] + edge.cost
+                    parent[edge.to_node] = edge
+                    last_updated = edge.to_node
+                    if stats is not None:
+                        stats.relaxations += 1
+            if last_updated is None:
+                return cost_change
+
+        # Walk back far enough to be sure we are on the cycle, then collect it
+        node = last_updated
+        for _ in range(len(nodes)):
+            node = parent[node].from_node
+        cycle = []
+        current = node
+        while True:
+            edge = parent[current]
+            cycle.append(edge)
+            current = edge.from_node
+            if current == node:
+                break
+
+        push = min(edge.capacity - edge.flow for edge in cycle)
+        for edge in cycle:
+            edge.flow += push
+            edge.reverse_edge.flow -= push
+        cost_change += push * sum(edge.cost for edge in cycle)
+        if stats is not None:
+            stats.augmentations += 1
+
+
+# ----------------- Flow Decomposition ----------------- #
+def decompose_flow(arc_flows, source, sink):
+    """
+    Splits a source-sink flow into path flows, for solvers that do not augment along paths.
+    arc_flows holds (u, v, flow) triples. Flow cycles met on the way are cancelled, not reported.
+    Yields (flow, path) pairs, each path being the list of nodes from source to sink, one at a
+    time: only the path being built is held.
+    """
+    out_arcs = defaultdict(list)
+    for u, v, flow in arc_flows:
+        if flow > 0:
+            out_arcs[u].append([v, flow])
+    pointer = defaultdict(int)
 
-def print_results(flow, cost, num_paths, mean_length, mean_proportional_length, file_path, algo, filename):
+    while True:
+        path = [source]
+        cells = []
+        position = {source: 0}
+        u = source
+        while u != sink:
+            arcs = out_arcs[u]
+            i = pointer[u]
+            while i < len(arcs) and arcs[i][1] <= 0:
+                i += 1
+            pointer[u] = i
+            if i == len(arcs):
+                break
+
+            cell = arcs[i]
+            v = cell[0]
+            if v in position:
+                # Cancel the cycle and continue from where it closed
+                k = position[v]
+                cycle_flow = min(c[1] for c in cells[k:] + [cell])
+                for c in cells[k:] + [cell]:
+                    c[1] -= cycle_flow
+                for w in path[k + 1:]:
+                    del position[w]
+                del path[k + 1:]
+                del cells[k:]
+                u = v
+                continue
+
+            position[v] = len(path)
+            path.append(v)
+            cells.append(cell)
+            u = v
+
+        if u != sink:
+            if u == source:
+                return
+            cells[-1][1] = 0  # Flow that does not reach the sink (rounding leftovers)
+            continue
+
+        path_flow = min(c[1] for c in cells)
+        for c in cells:
+            c[1] -= path_flow
+        yield path_flow, path
+
+
+def print_results(flow, cost, num_paths, mean_length, mean_proportional_length, file_path, algo, filename,
+                  writer=None, arcs=None):
     """
     Print algorithm results with formatted output.
+    The row is appended to file_path, or buffered in writer (a results_writer.ResultWriter) when one is given.
+    arcs ("forward" or "residual") adds the arcs the algorithm could use as a last column.
     """
-    algo_header_format = "{:<15}\t{:<15}\t{:<8.4f}\t{:<12.4f}\t{:<10}\t{:<10.4f}\t{:<10.4f}"
-
     if flow is not None:
         print(f"flow:{flow} | cost:{cost} | paths:{num_paths} | ML:{mean_length} | MPL:{mean_proportional_length}")
     else:
         print("\nFailed to meet the flow demand.")
     print("---------------------")
 
-    try:
-        parts = filename.split('_')
-        graph_id = parts[1]
-    except Exception as e:
+    row = algorithm_row(algo, filename, flow, cost, num_paths, mean_length, mean_proportional_length, arcs)
+    if row["graph_id"] is None:
         print(f"Error parsing filename '{filename}'")
-        graph_id = filename
-
-    with open(file_path, 'a', encoding='utf-8') as results:
-        results.write(algo_header_format.format(
-            algo,  # Algorithm name
-            graph_id,  # Graph number
-            flow or 0,  # Flow (with fallback to 0 if None)
-            cost or 0,  # Cost (with fallback to 0 if None)
-            num_paths or 'N/A',  # Number of paths
-            mean_length or 0,  # Mean length
-            mean_proportional_length or 0  # Mean proportional length
-        ))
-        results.write("\n")
\ No newline at end of file
+
+    if writer is not None:
+        writer.add(row)
+    else:
+        with open(file_path, 'a', encoding='utf-8') as results:
+            results.write(format_algorithm_row(row) + "\n")
\ No newline at end of file